@@ -5,8 +5,1687 @@ from datetime import datetime
 import csv
 import json
 import os
+import threading
+import queue
+import gzip
+import lzma
+import io
+import re
+import time
+import struct
+import math
+import random
+import base64
+import bisect
+import itertools
+import multiprocessing
+import concurrent.futures
+from collections import Counter, deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+BULK_CHUNK_SIZE = 500
+BULK_TEMP_TABLE_THRESHOLD = 20000
+PROFILE_BATCH_SIZE = 10000
+PROFILE_SAMPLE_SIZE = 10000
+SAMPLE_PROBE_FACTOR = 50
+CELL_PREVIEW_LIMIT = 256
+CELL_PAGE_SIZE = 65536
+CELL_CHUNK_SIZE = 1 << 20
+IMAGE_PREVIEW_LIMIT = 16 << 20
+RESULT_MEMORY_BUDGET = 64 << 20
+RESULT_FETCH_SIZE = 1000
+RESULT_PAGE_SIZE = 5000
+STATEMENT_CACHE_SIZE = 512
+MAX_RESULT_TABS = 20
+WATCH_INTERVAL_MS = 1000
+WATCH_FULL_CHECK_TICKS = 10
+SEARCH_DEBOUNCE_MS = 150
+SEARCH_RESULT_LIMIT = 500
+DATA_WINDOW_SIZE = 500
+ROWID_HISTOGRAM_SIZE = 2000
+CSV_CHUNK_SIZE = 4 << 20
+CSV_PARALLEL_THRESHOLD = 16 << 20
+CSV_TYPE_SAMPLE_ROWS = 1000
+JSON_READ_SIZE = 1 << 20
+JSON_BATCH_SIZE = 5000
+JSON_SAMPLE_ROWS = 1000
+SHADOW_TABLE_SUFFIXES = ('_content', '_segments', '_segdir', '_docsize', '_stat', '_data', '_idx', '_config',
+                         '_node', '_parent', '_rowid')
+WAL_INDEX_READ_SIZE = 100
+WAL_PANEL_REFRESH_MS = 1000
+CHECKPOINT_POLL_MS = 1000
+ANALYSIS_LIMIT = 1000
+ANALYZE_POLL_MS = 10000
+MASK64 = (1 << 64) - 1
+
+class TaskCancelled(Exception):
+    pass
+
+class SqlImportError(Exception):
+    def __init__(self, line_no, statement, error, committed):
+        preview = statement if len(statement) <= 500 else statement[:500] + "..."
+        super().__init__(f"Line {line_no}: {error}\n\n{preview}\n\n"
+                         f"{committed:,} statements before this batch were committed.")
+        self.line_no = line_no
+        self.statement = statement
+
+class BackgroundTask:
+    def __init__(self, title):
+        self.title = title
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        
+    def report(self, text, fraction=None):
+        self.messages.put(('progress', text, fraction))
+        
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+            
+    def cancel(self):
+        self.cancel_event.set()
+
+class Workspace:
+    def __init__(self, name):
+        self.name = name
+        self.db_path = None
+        self.conn = None
+        self.cursor = None
+        self.current_table = None
+        self.attached = {}
+        self.pending_changes = {}
+        self.data_where = ""
+        self.data_params = ()
+        self.data_order = None
+        self.data_rowid = None
+        self.select_all_matching = False
+        self.data_sample = None
+        self.data_columns = []
+        self.data_truncated = {}
+        self.data_values = {}
+        self.query_tab = None
+        self.result_sets = []
+        self.param_entries = {}
+        self.param_source = None
+        self.watch_files = None
+        self.watch_versions = None
+        self.watch_ticks = 0
+        self.object_index = None
+        self.data_window = None
+        self.rowid_histograms = {}
+        self.data_filter = None
+        self.checkpoint_policy = None
+        self.analyze_policy = None
+        
+        self.busy = False
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self.run_jobs, daemon=True)
+        self.worker.start()
+        
+    def run_jobs(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            self.busy = True
+            try:
+                job()
+            finally:
+                self.busy = False
+                
+    def submit(self, job):
+        self.jobs.put(job)
+        
+    def shutdown(self):
+        self.jobs.put(None)
+        
+    def discard_results(self):
+        for result in self.result_sets:
+            result.close()
+        self.result_sets = []
+
+def workspace_attribute(name):
+    return property(lambda self: getattr(self.workspace, name),
+                    lambda self, value: setattr(self.workspace, name, value))
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def sql_literal(value):
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value != value:
+            return "NULL"
+        if value in (float('inf'), float('-inf')):
+            return "1e999" if value > 0 else "-1e999"
+        return repr(value)
+    if isinstance(value, bytes):
+        return f"X'{value.hex()}'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+def open_text_file(file_path, mode, compression=None):
+    if compression is None:
+        if file_path.endswith('.gz'):
+            compression = 'gzip'
+        elif file_path.endswith('.xz'):
+            compression = 'xz'
+            
+    if compression == 'gzip':
+        return gzip.open(file_path, mode + 't', encoding='utf-8')
+    if compression == 'xz':
+        return lzma.open(file_path, mode + 't', encoding='utf-8')
+    return open(file_path, mode, encoding='utf-8', newline='' if 'w' in mode else None)
+
+def file_signature(paths):
+    signature = []
+    for path in paths:
+        for suffix in ('', '-wal'):
+            try:
+                st = os.stat(path + suffix)
+                signature.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+    return tuple(signature)
+
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+def read_wal_index(db_path):
+    try:
+        with open(db_path + '-shm', 'rb') as f:
+            header = f.read(WAL_INDEX_READ_SIZE)
+    except OSError:
+        return None
+    if len(header) < WAL_INDEX_READ_SIZE or not header[12] or header[:48] != header[48:96]:
+        return None
+    return struct.unpack_from('=I', header, 16)[0], struct.unpack_from('=I', header, 96)[0]
+
+def wal_status(conn, paths):
+    status = []
+    for schema, path in paths.items():
+        mode = conn.execute(f"PRAGMA {schema}.journal_mode").fetchone()[0]
+        try:
+            wal_size = os.path.getsize(path + '-wal')
+        except OSError:
+            wal_size = None
+        status.append((schema, mode, wal_size, read_wal_index(path) if mode == 'wal' else None))
+    return status
+
+def checkpoint_databases(conn, paths, mode):
+    results = []
+    for schema, path in paths.items():
+        index = read_wal_index(path)
+        busy, log, checkpointed = conn.execute(f"PRAGMA {schema}.wal_checkpoint({mode})").fetchone()
+        results.append((schema, index[0] - index[1] if index else None, busy, log, checkpointed))
+    return results
+
+def describe_checkpoint(results):
+    lines = []
+    for schema, pending, busy, log, checkpointed in results:
+        if log < 0:
+            lines.append(f"{schema}: not in WAL mode")
+            continue
+        if log == 0 and not busy:
+            text = f"{schema}: WAL reset"
+        else:
+            text = f"{schema}: {checkpointed:,} of {log:,} frames checkpointed"
+        if pending is not None:
+            text += f" ({pending:,} pending before)"
+        if busy:
+            text += ", blocked by other connections"
+        elif checkpointed < log:
+            text += f", {log - checkpointed:,} held back by readers"
+        lines.append(text)
+    return lines
+
+def check_database(conn, mode, scopes, max_errors, foreign_keys, task):
+    started = time.time()
+    state = {'text': "Starting...", 'fraction': 0.0, 'reported': started}
+    problems = []
+    
+    def progress():
+        now = time.time()
+        if now - state['reported'] >= 0.2:
+            state['reported'] = now
+            if task.cancel_event.is_set():
+                return 1
+            task.report(f"{state['text']} | {now - started:,.0f}s elapsed | {len(problems):,} problems",
+                        state['fraction'])
+        return 0
+    
+    checks = [(mode, scope) for scope in scopes]
+    if foreign_keys:
+        checks.extend(('foreign_key_check', scope) for scope in scopes)
+    
+    conn.set_progress_handler(progress, 1000)
+    try:
+        for i, (check, (schema, table)) in enumerate(checks):
+            remaining = max_errors - len(problems)
+            if remaining <= 0:
+                break
+            label = f"{schema}.{table}" if table else schema
+            state['text'] = f"{check} {label} ({i + 1} of {len(checks)})"
+            state['fraction'] = i / len(checks)
+            task.report(state['text'], state['fraction'])
+            
+            if check == 'foreign_key_check':
+                cursor = conn.execute(f"PRAGMA {schema}.foreign_key_check" + (f"({sql_literal(table)})" if table else ""))
+                for child, rowid, parent, fkid in cursor.fetchmany(remaining):
+                    problems.append((check, f"{schema}.{child}",
+                                     f"Row {rowid} references a missing row in {parent} (foreign key {fkid})"))
+            else:
+                cursor = conn.execute(f"PRAGMA {schema}.{check}({sql_literal(table) if table else remaining})")
+                problems.extend((check, label, message) for (message,) in cursor.fetchmany(remaining) if message != 'ok')
+    except sqlite3.OperationalError:
+        task.check_cancelled()
+        raise
+    finally:
+        conn.set_progress_handler(None, 0)
+    
+    return problems, time.time() - started, len(problems) >= max_errors
+
+def unanalyzed_tables(conn):
+    query = ("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+             "AND sql NOT LIKE 'CREATE VIRTUAL TABLE%'")
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+        query += " AND name NOT IN (SELECT tbl FROM sqlite_stat1)"
+    return [row[0] for row in conn.execute(query)]
+
+def optimize_database(conn, analysis_limit, tables=None):
+    conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+    if tables is None:
+        tables = [quote_identifier(name) for name in unanalyzed_tables(conn)]
+    for table in tables:
+        conn.execute(f"ANALYZE {table}")
+    conn.execute("PRAGMA optimize")
+    conn.commit()
+    return len(tables)
+
+def analyze_database(conn, analysis_limit):
+    started = time.time()
+    conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+    conn.execute("ANALYZE")
+    conn.commit()
+    return time.time() - started
+
+def optimize_after_import(conn, analysis_limit, tables, task):
+    task.report("Updating query planner statistics...")
+    try:
+        optimize_database(conn, analysis_limit, tables)
+    except sqlite3.Error:
+        pass
+
+def planner_stats(conn, schema):
+    stat_tables = {row[0] for row in conn.execute(
+        f"SELECT name FROM {schema}.sqlite_master WHERE name IN ('sqlite_stat1', 'sqlite_stat4')")}
+    tables = [row[0] for row in conn.execute(
+        f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    stat1 = {}
+    if 'sqlite_stat1' in stat_tables:
+        for tbl, idx, stat in conn.execute(f"SELECT tbl, idx, stat FROM {schema}.sqlite_stat1"):
+            stat1.setdefault(tbl, []).append((idx, stat))
+    stat4 = None
+    if 'sqlite_stat4' in stat_tables:
+        stat4 = {}
+        for tbl, idx, neq, nlt, ndlt in conn.execute(f"SELECT tbl, idx, neq, nlt, ndlt FROM {schema}.sqlite_stat4"):
+            stat4.setdefault((tbl, idx), []).append((neq, nlt, ndlt))
+    return tables, stat1, stat4
+
+def statement_keyword(statement):
+    text = statement.lstrip()
+    while text.startswith(('--', '/*')):
+        if text.startswith('--'):
+            end = text.find('\n')
+            text = text[end + 1:].lstrip() if end >= 0 else ""
+        else:
+            end = text.find('*/')
+            text = text[end + 2:].lstrip() if end >= 0 else ""
+    match = re.match(r'[A-Za-z]+', text)
+    return match.group(0).upper() if match else ""
+
+def is_transaction_control(statement):
+    keyword = statement_keyword(statement)
+    if keyword in ('BEGIN', 'COMMIT', 'END'):
+        return True
+    return keyword == 'ROLLBACK' and not re.search(r'\bTO\b', statement, re.IGNORECASE)
+
+def iter_sql_statements(lines):
+    pending = ""
+    start_line = 1
+    for line_no, line in enumerate(lines, 1):
+        if not pending.strip():
+            pending = ""
+            start_line = line_no
+        pending += line
+        if ';' not in line:
+            continue
+            
+        search_from = len(pending) - len(line)
+        while True:
+            pos = pending.find(';', search_from)
+            if pos < 0:
+                break
+            candidate = pending[:pos + 1]
+            if not sqlite3.complete_statement(candidate):
+                search_from = pos + 1
+                continue
+            leading = candidate[:len(candidate) - len(candidate.lstrip())]
+            yield start_line + leading.count('\n'), candidate.strip()
+            start_line += candidate.count('\n')
+            pending = pending[pos + 1:]
+            search_from = 0
+            
+    if pending.strip():
+        leading = pending[:len(pending) - len(pending.lstrip())]
+        yield start_line + leading.count('\n'), pending.strip()
+
+def import_sql_stream(conn, file_path, batch_size, task):
+    total_bytes = max(os.path.getsize(file_path), 1)
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    executed = committed = 0
+    started = last_report = time.time()
+    
+    with open(file_path, 'rb') as raw:
+        if file_path.endswith('.gz'):
+            stream = gzip.open(raw, 'rt', encoding='utf-8')
+        elif file_path.endswith('.xz'):
+            stream = lzma.open(raw, 'rt', encoding='utf-8')
+        else:
+            stream = io.TextIOWrapper(raw, encoding='utf-8')
+            
+        cursor.execute("BEGIN")
+        try:
+            for line_no, statement in iter_sql_statements(stream):
+                if is_transaction_control(statement):
+                    continue
+                    
+                outside = statement_keyword(statement) in ('PRAGMA', 'VACUUM', 'ATTACH', 'DETACH')
+                try:
+                    if outside:
+                        cursor.execute("COMMIT")
+                        committed = executed
+                        cursor.execute(statement)
+                        cursor.execute("BEGIN")
+                    else:
+                        cursor.execute(statement)
+                except sqlite3.Error as e:
+                    raise SqlImportError(line_no, statement, e, committed)
+                executed += 1
+                
+                if executed - committed >= batch_size:
+                    cursor.execute("COMMIT")
+                    committed = executed
+                    cursor.execute("BEGIN")
+                    
+                now = time.time()
+                if now - last_report >= 0.2:
+                    task.check_cancelled()
+                    last_report = now
+                    position = raw.tell()
+                    elapsed = max(now - started, 1e-6)
+                    task.report(f"Line {line_no:,} | {executed:,} statements | "
+                                f"{position / 1048576 / elapsed:.1f} MB/s | {executed / elapsed:,.0f} statements/s",
+                                position / total_bytes)
+                                
+            cursor.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+            
+    return executed, time.time() - started
+
+def csv_column_type(values):
+    kind = None
+    for value in values:
+        if not value:
+            continue
+        if re.fullmatch(r'-?\d+', value):
+            if not -2 ** 63 <= int(value) < 2 ** 63:
+                return 'TEXT'
+            kind = kind or 'INTEGER'
+        elif re.fullmatch(r'-?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?', value):
+            kind = 'REAL'
+        else:
+            return 'TEXT'
+    return kind or 'TEXT'
+
+def csv_integer(value):
+    number = int(value)
+    return number if -2 ** 63 <= number < 2 ** 63 else value
+
+def last_csv_boundary(data):
+    quotes_after = 0
+    end = len(data)
+    position = data.rfind(b'\n')
+    total_quotes = data.count(b'"')
+    while position >= 0:
+        quotes_after += data.count(b'"', position, end)
+        if (total_quotes - quotes_after) % 2 == 0:
+            return position + 1
+        end = position
+        position = data.rfind(b'\n', 0, position)
+    return 0
+
+def iter_csv_chunks(f, chunk_size):
+    buffer = b''
+    while True:
+        block = f.read(chunk_size)
+        if not block:
+            if buffer:
+                yield buffer
+            return
+        buffer += block
+        cut = last_csv_boundary(buffer)
+        if cut:
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+
+def parse_csv_chunk(data, encoding, width, types, skip_header):
+    reader = csv.reader(io.StringIO(data.decode(encoding), newline=''))
+    if skip_header:
+        next(reader, None)
+    converters = [csv_integer if kind == 'INTEGER' else float if kind == 'REAL' else None for kind in types]
+    rows = []
+    for row in reader:
+        if not row:
+            continue
+        if len(row) != width:
+            row = (row + [None] * width)[:width]
+        for i, convert in enumerate(converters):
+            if convert is not None:
+                value = row[i]
+                try:
+                    row[i] = convert(value)
+                except (TypeError, ValueError):
+                    row[i] = value or None
+        rows.append(row)
+    return rows
+
+def iter_parsed_csv_chunks(jobs, width, types, workers, preserve_order, task):
+    if workers <= 1:
+        for data, encoding, skip_header in jobs:
+            task.check_cancelled()
+            yield len(data), parse_csv_chunk(data, encoding, width, types, skip_header)
+        return
+    
+    executor = concurrent.futures.ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+    pending = deque()
+    
+    def take():
+        if preserve_order:
+            size, future = pending.popleft()
+        else:
+            finished, _ = concurrent.futures.wait([future for _, future in pending],
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+            entry = next(entry for entry in pending if entry[1] in finished)
+            pending.remove(entry)
+            size, future = entry
+        return size, future.result()
+    
+    try:
+        for data, encoding, skip_header in jobs:
+            while len(pending) >= workers * 2:
+                yield take()
+                task.check_cancelled()
+            pending.append((len(data), executor.submit(parse_csv_chunk, data, encoding, width, types, skip_header)))
+        while pending:
+            yield take()
+            task.check_cancelled()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def import_csv_stream(conn, file_path, table_name, workers, preserve_order, task):
+    total_bytes = max(os.path.getsize(file_path), 1)
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    started = last_report = time.time()
+    
+    with open(file_path, 'rb') as raw:
+        chunks = iter_csv_chunks(raw, CSV_CHUNK_SIZE)
+        first = next(chunks, b'')
+        reader = csv.reader(io.StringIO(first.decode('utf-8-sig'), newline=''))
+        headers = next(reader, None)
+        if not headers:
+            raise ValueError("The CSV file has no header row")
+        sample = list(itertools.islice(reader, CSV_TYPE_SAMPLE_ROWS))
+        types = [csv_column_type(row[i] for row in sample if i < len(row)) for i in range(len(headers))]
+        if total_bytes < CSV_PARALLEL_THRESHOLD:
+            workers = 1
+        
+        col_defs = [f"{quote_identifier(header.strip().replace(' ', '_'))} {col_type}"
+                    for header, col_type in zip(headers, types)]
+        insert_sql = f"INSERT INTO {quote_identifier(table_name)} VALUES ({','.join('?' * len(headers))})"
+        jobs = itertools.chain([(first, 'utf-8-sig', True)], ((chunk, 'utf-8', False) for chunk in chunks))
+        
+        rows_imported = 0
+        position = 0
+        cursor.execute("BEGIN")
+        try:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {quote_identifier(table_name)} ({', '.join(col_defs)})")
+            for size, rows in iter_parsed_csv_chunks(jobs, len(headers), types, workers, preserve_order, task):
+                cursor.executemany(insert_sql, rows)
+                rows_imported += len(rows)
+                position += size
+                
+                now = time.time()
+                if now - last_report >= 0.2:
+                    task.check_cancelled()
+                    last_report = now
+                    elapsed = max(now - started, 1e-6)
+                    task.report(f"{rows_imported:,} rows | {position / 1048576 / elapsed:.1f} MB/s | "
+                                f"{rows_imported / elapsed:,.0f} rows/s | {workers} parser processes",
+                                position / total_bytes)
+            
+            cursor.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+    
+    return rows_imported, time.time() - started
+
+class JsonStream:
+    WHITESPACE = re.compile(r'[\s\ufeff]*')
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = ''
+        self.pos = 0
+        self.keep = None
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.empty_tables = []
+        
+    def fill(self):
+        if self.eof:
+            return False
+        data = self.stream.read(JSON_READ_SIZE)
+        if not data:
+            self.eof = True
+            return False
+        start = self.pos if self.keep is None else min(self.pos, self.keep)
+        if start > len(self.buffer) // 2:
+            self.buffer = self.buffer[start:]
+            self.pos -= start
+            if self.keep is not None:
+                self.keep -= start
+        self.buffer += data
+        return True
+        
+    def peek(self):
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+                
+    def take(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON but found {found!r}")
+        self.pos += 1
+        
+    def take_end(self):
+        found = self.peek()
+        if found:
+            raise ValueError(f"Unexpected {found!r} after the end of the JSON document")
+            
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+            
+    def iter_array(self):
+        self.take('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.peek() == ',':
+                self.pos += 1
+            else:
+                self.take(']')
+                return
+                
+    def layout(self):
+        first = self.peek()
+        if first == '[':
+            return 'records'
+        if first != '{':
+            raise ValueError("The file does not start with a JSON array or object")
+            
+        start = self.keep = self.pos
+        try:
+            self.pos += 1
+            if self.peek() == '}':
+                return 'database'
+            if self.peek() == '"':
+                self.decode()
+                if self.peek() == ':':
+                    self.pos += 1
+                    if self.peek() == '[':
+                        self.pos += 1
+                        if self.peek() in ('{', ']'):
+                            return 'database'
+            return 'records'
+        finally:
+            self.pos = start
+            self.keep = None
+            
+    def iter_records(self, layout):
+        if layout == 'database':
+            self.take('{')
+            if self.peek() == '}':
+                self.pos += 1
+                return
+            while True:
+                table = self.decode()
+                self.take(':')
+                empty = True
+                for record in self.iter_array():
+                    empty = False
+                    yield table, record
+                if empty:
+                    self.empty_tables.append(table)
+                if self.peek() == ',':
+                    self.pos += 1
+                else:
+                    self.take('}')
+                    self.take_end()
+                    return
+        elif self.peek() == '[':
+            for record in self.iter_array():
+                yield None, record
+            self.take_end()
+        else:
+            while self.peek():
+                yield None, self.decode()
+
+def json_sql_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+        return str(value)
+    return value
+
+def json_column_type(values):
+    kinds = {('TEXT' if isinstance(json_sql_value(value), str) else
+              'REAL' if isinstance(value, float) else 'INTEGER')
+             for value in values if value is not None}
+    if kinds <= {'INTEGER'}:
+        return 'INTEGER' if kinds else ''
+    if kinds <= {'INTEGER', 'REAL'}:
+        return 'REAL'
+    return 'TEXT' if kinds == {'TEXT'} else ''
+
+def import_json_stream(conn, file_path, layout, default_table, task):
+    total_bytes = max(os.path.getsize(file_path), 1)
+    conn.isolation_level = None
+    cursor = conn.cursor()
+    started = last_report = time.time()
+    imported = {}
+    ignored = Counter()
+    skipped = Counter()
+    empty = []
+    
+    with open(file_path, 'rb') as raw:
+        if file_path.endswith('.gz'):
+            stream = gzip.open(raw, 'rt', encoding='utf-8')
+        elif file_path.endswith('.xz'):
+            stream = lzma.open(raw, 'rt', encoding='utf-8')
+        else:
+            stream = io.TextIOWrapper(raw, encoding='utf-8')
+            
+        cursor.execute("BEGIN")
+        try:
+            json_stream = JsonStream(stream)
+            records = json_stream.iter_records(layout)
+            for table_name, group in itertools.groupby(records, key=lambda pair: pair[0]):
+                table_name = table_name or default_table
+                if table_name.lower().startswith('sqlite_'):
+                    skipped[table_name] += sum(1 for _ in group)
+                    continue
+                rows = (record for _, record in group)
+                sample = list(itertools.islice(rows, JSON_SAMPLE_ROWS))
+                for record in sample:
+                    if not isinstance(record, dict):
+                        raise ValueError(f"Expected JSON objects in {table_name}, found {type(record).__name__}")
+                        
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ? COLLATE NOCASE", (table_name,))
+                if cursor.fetchone():
+                    cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+                    columns = [col[1] for col in cursor.fetchall()]
+                else:
+                    columns = list(dict.fromkeys(key for record in sample for key in record))
+                    if not columns:
+                        empty.append(table_name)
+                        continue
+                    col_defs = [f"{quote_identifier(col)} {json_column_type(record.get(col) for record in sample)}"
+                                for col in columns]
+                    cursor.execute(f"CREATE TABLE {quote_identifier(table_name)} ({', '.join(col_defs)})")
+                    
+                known = set(columns)
+                insert_sql = (f"INSERT INTO {quote_identifier(table_name)} ({', '.join(map(quote_identifier, columns))}) "
+                              f"VALUES ({','.join('?' * len(columns))})")
+                count = imported.setdefault(table_name, 0)
+                batch = []
+                for record in itertools.chain(sample, rows):
+                    if not isinstance(record, dict):
+                        raise ValueError(f"Expected JSON objects in {table_name}, found {type(record).__name__}")
+                    extra = record.keys() - known
+                    if extra:
+                        ignored.update(f"{table_name}.{key}" for key in extra)
+                    batch.append([json_sql_value(record.get(col)) for col in columns])
+                    if len(batch) >= JSON_BATCH_SIZE:
+                        cursor.executemany(insert_sql, batch)
+                        count += len(batch)
+                        batch = []
+                        
+                        now = time.time()
+                        if now - last_report >= 0.2:
+                            task.check_cancelled()
+                            last_report = now
+                            position = raw.tell()
+                            elapsed = max(now - started, 1e-6)
+                            task.report(f"{table_name}: {count:,} rows | {position / 1048576 / elapsed:.1f} MB/s",
+                                        position / total_bytes)
+                if batch:
+                    cursor.executemany(insert_sql, batch)
+                    count += len(batch)
+                imported[table_name] = count
+                
+            for table_name in json_stream.empty_tables:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ? COLLATE NOCASE", (table_name,))
+                if not cursor.fetchone():
+                    empty.append(table_name)
+            cursor.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+            
+    return imported, ignored, skipped, empty, time.time() - started
+
+def mix64(x):
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def mix64_array(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def sqlite_sort_key(value):
+    if value is None:
+        return (-1, 0)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, value)
+
+class HyperLogLog:
+    def __init__(self, precision=12):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        
+    def add_values(self, values):
+        shift = 64 - self.precision
+        low_mask = (1 << shift) - 1
+        
+        if np is not None and len(values) > 64:
+            hashes = np.fromiter((hash(v) for v in values), dtype=np.int64, count=len(values))
+            hashes = mix64_array(hashes.view(np.uint64))
+            index = (hashes >> np.uint64(shift)).astype(np.intp)
+            bits = np.frexp((hashes & np.uint64(low_mask)).astype(np.float64))[1]
+            rank = (shift + 1 - bits).astype(np.uint8)
+            np.maximum.at(np.frombuffer(self.registers, dtype=np.uint8), index, rank)
+            return
+            
+        registers = self.registers
+        for value in values:
+            h = mix64(hash(value) & MASK64)
+            index = h >> shift
+            rank = shift + 1 - (h & low_mask).bit_length()
+            if rank > registers[index]:
+                registers[index] = rank
+                
+    def estimate(self):
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class TopValues:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.counts = {}
+        
+    def merge(self, counts):
+        combined = Counter(self.counts)
+        combined.update(counts)
+        if len(combined) <= self.capacity:
+            self.counts = dict(combined)
+            return
+        top = combined.most_common(self.capacity + 1)
+        cutoff = top[-1][1]
+        self.counts = {value: count - cutoff for value, count in top[:-1] if count > cutoff}
+        
+    def most_common(self, n):
+        return Counter(self.counts).most_common(n)
+
+class ColumnProfile:
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.minimum = None
+        self.maximum = None
+        self.types = Counter()
+        self.distinct = HyperLogLog()
+        self.top = TopValues()
+        self.numeric_count = 0
+        self.numeric_min = None
+        self.numeric_max = None
+        self.numeric_sum = 0.0
+        self.sample = []
+        
+    def add(self, values):
+        self.count += len(values)
+        non_null = [v for v in values if v is not None]
+        self.nulls += len(values) - len(non_null)
+        if not non_null:
+            return
+            
+        numeric = [v for v in non_null if isinstance(v, (int, float))]
+        if np is not None and numeric and len(numeric) == len(non_null):
+            self.add_numeric_array(numeric)
+            return
+            
+        self.types.update(type(v).__name__ for v in non_null)
+        self.update_range(min(non_null, key=sqlite_sort_key), max(non_null, key=sqlite_sort_key))
+        self.distinct.add_values(non_null)
+        self.top.merge(Counter(v if not isinstance(v, str) or len(v) <= 200 else v[:200] + "…"
+                               for v in non_null if not isinstance(v, bytes)))
+        if numeric:
+            self.add_numeric(numeric)
+            
+    def update_range(self, low, high):
+        if self.minimum is None or sqlite_sort_key(low) < sqlite_sort_key(self.minimum):
+            self.minimum = low
+        if self.maximum is None or sqlite_sort_key(high) > sqlite_sort_key(self.maximum):
+            self.maximum = high
+            
+    def add_numeric(self, numbers):
+        low, high = min(numbers), max(numbers)
+        self.numeric_min = low if self.numeric_min is None else min(self.numeric_min, low)
+        self.numeric_max = high if self.numeric_max is None else max(self.numeric_max, high)
+        self.numeric_sum += sum(numbers)
+        
+        for value in numbers:
+            self.numeric_count += 1
+            if len(self.sample) < PROFILE_SAMPLE_SIZE:
+                self.sample.append(value)
+            else:
+                j = random.randrange(self.numeric_count)
+                if j < PROFILE_SAMPLE_SIZE:
+                    self.sample[j] = value
+                    
+    def add_numeric_array(self, numbers):
+        is_int = all(type(v) is int for v in numbers)
+        array = np.array(numbers, dtype=np.int64 if is_int else np.float64)
+        low, high = array.min().item(), array.max().item()
+        
+        self.types.update({'int' if is_int else 'float': len(numbers)})
+        self.update_range(low, high)
+        self.numeric_min = low if self.numeric_min is None else min(self.numeric_min, low)
+        self.numeric_max = high if self.numeric_max is None else max(self.numeric_max, high)
+        self.numeric_sum += float(array.sum(dtype=np.float64))
+        self.distinct.add_values(numbers)
+        
+        unique, counts = np.unique(array, return_counts=True)
+        self.top.merge(dict(zip(unique.tolist(), counts.tolist())))
+        
+        fill = min(PROFILE_SAMPLE_SIZE - len(self.sample), len(array))
+        self.sample.extend(array[:fill].tolist())
+        rest = array[fill:]
+        if len(rest):
+            positions = self.numeric_count + fill + np.arange(1, len(rest) + 1)
+            slots = (np.random.random(len(rest)) * positions).astype(np.int64)
+            keep = slots < PROFILE_SAMPLE_SIZE
+            for slot, value in zip(slots[keep].tolist(), rest[keep].tolist()):
+                self.sample[slot] = value
+        self.numeric_count += len(array)
+        
+    def mean(self):
+        return self.numeric_sum / self.numeric_count if self.numeric_count else None
+        
+    def histogram(self, bins=20):
+        if not self.sample:
+            return []
+        low, high = self.numeric_min, self.numeric_max
+        if low == high:
+            return [(low, high, self.numeric_count)]
+            
+        width = (high - low) / bins
+        counts = [0] * bins
+        for value in self.sample:
+            counts[min(int((value - low) / width), bins - 1)] += 1
+        scale = self.numeric_count / len(self.sample)
+        return [(low + i * width, low + (i + 1) * width, round(c * scale)) for i, c in enumerate(counts)]
+
+def profile_table(conn, table_name, task):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT MAX(rowid) - MIN(rowid) + 1 FROM {table_name}")
+        estimate = cursor.fetchone()[0]
+    except sqlite3.OperationalError:
+        estimate = None
+        
+    cursor.execute(f"SELECT * FROM {table_name}")
+    profiles = [ColumnProfile(desc[0]) for desc in cursor.description]
+    rows_done = 0
+    
+    while True:
+        rows = cursor.fetchmany(PROFILE_BATCH_SIZE)
+        if not rows:
+            break
+        for profile, values in zip(profiles, zip(*rows)):
+            profile.add(values)
+        rows_done += len(rows)
+        
+        task.check_cancelled()
+        if estimate:
+            task.report(f"{rows_done:,} of ~{estimate:,} rows profiled", min(rows_done / estimate, 1.0))
+        else:
+            task.report(f"{rows_done:,} rows profiled")
+            
+    return rows_done, profiles
+
+def sample_table_rowids(cursor, table_name, rowid, size):
+    cursor.execute(f"SELECT MIN({rowid}), MAX({rowid}) FROM {table_name}")
+    low, high = cursor.fetchone()
+    if low is None:
+        return [], 0, 0, 'all'
+        
+    span = high - low + 1
+    if span <= 2 * size:
+        cursor.execute(f"SELECT {rowid} FROM {table_name}")
+        rowids = [row[0] for row in cursor.fetchall()]
+        total = len(rowids)
+        return random.sample(rowids, min(size, total)), total, 0, 'all'
+        
+    # Probes are drawn with replacement one chunk at a time, so memory follows the hits, not the budget
+    budget = min(span, size * SAMPLE_PROBE_FACTOR + 10000)
+    hits = set()
+    hit_probes = 0
+    probed = 0
+    while len(hits) < size and probed < budget:
+        chunk = [random.randint(low, high) for _ in range(min(BULK_CHUNK_SIZE, budget - probed))]
+        probed += len(chunk)
+        cursor.execute(f"SELECT {rowid} FROM {table_name} WHERE {rowid} IN ({', '.join('?' * len(chunk))})", chunk)
+        found = {row[0] for row in cursor.fetchall()}
+        hit_probes += sum(probe in found for probe in chunk)
+        hits.update(found)
+        if probed >= 10000 and hit_probes * budget < size * probed:
+            break
+        
+    density = hit_probes / probed
+    total = round(span * density)
+    error = round(1.96 * span * math.sqrt(density * (1 - density) / probed))
+    if len(hits) >= size:
+        return random.sample(list(hits), size), total, error, 'probe'
+        
+    cursor.execute(f"SELECT {rowid} FROM {table_name} LIMIT ?", (budget,))
+    rowids = [row[0] for row in cursor.fetchall()]
+    if len(rowids) < budget:
+        return random.sample(rowids, min(size, len(rowids))), len(rowids), 0, 'all'
+        
+    total = max(total, budget)
+    seen = set(hits)
+    for _ in range(size * 4):
+        if len(seen) >= size:
+            break
+        cursor.execute(f"SELECT {rowid} FROM {table_name} WHERE {rowid} >= ? ORDER BY {rowid} LIMIT 1",
+                       (random.randint(low, high),))
+        seen.add(cursor.fetchone()[0])
+    return list(seen), max(total, len(seen)), error, 'seek'
+
+def rowid_histogram(cursor, table_name, rowid):
+    rowids, total, _, method = sample_table_rowids(cursor, table_name, rowid, ROWID_HISTOGRAM_SIZE)
+    if not rowids:
+        return [], 0
+    if method == 'all' and len(rowids) == total:
+        return sorted(rowids), total
+    cursor.execute(f"SELECT MIN({rowid}), MAX({rowid}) FROM {table_name}")
+    low, high = cursor.fetchone()
+    return sorted({low, high, *rowids}), total
+
+def histogram_rowid(points, total, row_number):
+    if len(points) == total:
+        return points[min(max(row_number, 1), total) - 1]
+    position = (min(max(row_number, 1), total) - 1) / max(total - 1, 1) * (len(points) - 1)
+    i = min(int(position), len(points) - 2)
+    return round(points[i] + (points[i + 1] - points[i]) * (position - i))
+
+def histogram_row_number(points, total, rowid):
+    if len(points) == total:
+        return bisect.bisect_left(points, rowid) + 1
+    i = bisect.bisect_right(points, rowid) - 1
+    if i < 0:
+        return 1
+    if i >= len(points) - 1:
+        return total
+    fraction = (rowid - points[i]) / (points[i + 1] - points[i])
+    return round((i + fraction) / (len(points) - 1) * (total - 1)) + 1
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:,.0f} {unit}" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
+
+def format_cell_preview(value, length):
+    if isinstance(value, bytes):
+        return f"<BLOB {format_size(length)}> {value[:16].hex(' ')}…"
+    return f"{value}… ({length:,} chars)"
+
+def clip_cell(value):
+    if isinstance(value, (str, bytes)) and len(value) > CELL_PREVIEW_LIMIT:
+        return format_cell_preview(value[:CELL_PREVIEW_LIMIT], len(value))
+    return value
+
+def hex_dump(data, start=0):
+    lines = []
+    for offset in range(0, len(data), 16):
+        chunk = data[offset:offset + 16]
+        text = ''.join(chr(b) if 32 <= b < 127 else '.' for b in chunk)
+        lines.append(f"{start + offset:08x}  {chunk.hex(' '):<47}  {text}")
+    return '\n'.join(lines)
+
+class CellRef:
+    def __init__(self, schema, table, column, key_clause, key_params, rowid=None):
+        self.schema = schema
+        self.table = table
+        self.column = column
+        self.key_clause = key_clause
+        self.key_params = list(key_params)
+        self.rowid = rowid
+        
+    def select(self, conn, expression, params=()):
+        cursor = conn.execute(f"SELECT {expression} FROM {self.schema}.{self.table} WHERE {self.key_clause}",
+                              list(params) + self.key_params)
+        return cursor.fetchone()
+        
+    def info(self, conn):
+        column = quote_identifier(self.column)
+        return self.select(conn, f"typeof({column}), CASE typeof({column}) WHEN 'blob' THEN length({column}) "
+                                 f"ELSE length(CAST({column} AS BLOB)) END")
+                                 
+    def open_blob(self, conn):
+        if self.rowid is None or not hasattr(conn, 'blobopen'):
+            return None
+        try:
+            return conn.blobopen(self.table, self.column, self.rowid, readonly=True, name=self.schema)
+        except sqlite3.Error:
+            return None
+            
+    def read(self, conn, offset, size):
+        blob = self.open_blob(conn)
+        if blob is not None:
+            with blob:
+                blob.seek(offset)
+                return blob.read(size)
+        row = self.select(conn, f"substr(CAST({quote_identifier(self.column)} AS BLOB), ?, ?)", (offset + 1, size))
+        return row[0] if row and row[0] is not None else b''
+        
+    def iter_chunks(self, conn, chunk_size=CELL_CHUNK_SIZE):
+        blob = self.open_blob(conn)
+        if blob is not None:
+            with blob:
+                while True:
+                    data = blob.read(chunk_size)
+                    if not data:
+                        return
+                    yield data
+        offset = 0
+        while True:
+            data = self.read(conn, offset, chunk_size)
+            if not data:
+                return
+            yield data
+            offset += len(data)
+
+def estimate_row_size(row):
+    size = 56 + 8 * len(row)
+    for value in row:
+        size += 49 + len(value) if isinstance(value, (str, bytes)) else 32
+    return size
+
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+def like_contains_pattern(text):
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+def like_text(value):
+    # Mirrors LIKE: blobs compare as UTF-8 text and only ASCII letters fold case
+    text = value.decode('utf-8', 'replace') if isinstance(value, bytes) else str(value)
+    return text.translate(ASCII_LOWER)
+
+class ResultStore:
+    def __init__(self, columns):
+        self.columns = columns
+        self.conn = sqlite3.connect('')
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute(f"CREATE TABLE result ({', '.join(f'c{i}' for i in range(len(columns)))})")
+        self.insert_sql = f"INSERT INTO result VALUES ({', '.join('?' * len(columns))})"
+        self.count = 0
+        self.indexed = set()
+        
+    def add(self, rows):
+        self.conn.executemany(self.insert_sql, rows)
+        self.count += len(rows)
+        
+    def finish(self):
+        self.conn.commit()
+        
+    def where(self, filter_text):
+        if not filter_text:
+            return "", []
+        return (" WHERE " + " OR ".join(f"CAST(c{i} AS TEXT) LIKE ? ESCAPE '\\'" for i in range(len(self.columns))),
+                [like_contains_pattern(filter_text)] * len(self.columns))
+                
+    def count_matching(self, filter_text):
+        if not filter_text:
+            return self.count
+        where, params = self.where(filter_text)
+        return self.conn.execute(f"SELECT COUNT(*) FROM result{where}", params).fetchone()[0]
+        
+    def page(self, offset, limit, order=None, descending=False, filter_text=""):
+        where, params = self.where(filter_text)
+        order_by = "rowid"
+        if order is not None:
+            if order not in self.indexed:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS result_c{order} ON result (c{order})")
+                self.indexed.add(order)
+            order_by = f"c{order} {'DESC' if descending else 'ASC'}, rowid"
+        return self.conn.execute(f"SELECT * FROM result{where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                                 params + [limit, offset]).fetchall()
+                                 
+    def close(self):
+        self.conn.close()
+
+def read_result_set(cursor, budget):
+    columns = [desc[0] for desc in cursor.description]
+    rows = []
+    size = 0
+    store = None
+    while True:
+        batch = cursor.fetchmany(RESULT_FETCH_SIZE)
+        if not batch:
+            break
+        if store:
+            store.add(batch)
+            continue
+        rows.extend(batch)
+        size += sum(map(estimate_row_size, batch))
+        if size > budget:
+            store = ResultStore(columns)
+            store.add(rows)
+            rows = []
+    if store:
+        store.finish()
+    return columns, rows, store
+
+class ResultSet:
+    def __init__(self, title, columns, rows, store, elapsed):
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+        self.store = store
+        self.elapsed = elapsed
+        self.order = None
+        self.descending = False
+        self.filter = ''
+        self.offset = 0
+        self.statement = None
+        self.shown = (0, 0)
+        self.tab = None
+        self.tree = None
+        
+    @property
+    def count(self):
+        return self.store.count if self.store else len(self.rows)
+        
+    def clamp_offset(self, total):
+        self.offset = max(0, min(self.offset, max(total - 1, 0) // RESULT_PAGE_SIZE * RESULT_PAGE_SIZE))
+        
+    def page(self):
+        if self.store:
+            total = self.store.count_matching(self.filter)
+            self.clamp_offset(total)
+            return total, self.store.page(self.offset, RESULT_PAGE_SIZE, self.order, self.descending, self.filter)
+            
+        rows = self.rows
+        if self.filter:
+            needle = self.filter.translate(ASCII_LOWER)
+            rows = [row for row in rows if any(needle in like_text(value) for value in row if value is not None)]
+        if self.order is not None:
+            rows = sorted(rows, key=lambda row: sqlite_sort_key(row[self.order]), reverse=self.descending)
+        total = len(rows)
+        self.clamp_offset(total)
+        return total, rows[self.offset:self.offset + RESULT_PAGE_SIZE]
+        
+    def close(self):
+        if self.store:
+            self.store.close()
+
+SQL_TOKEN_PATTERN = re.compile(r"""
+    '(?:[^']|'')*'                      # string literal
+  | "(?:[^"]|"")*"                      # quoted identifier
+  | `[^`]*`
+  | \[[^\]]*\]
+  | --[^\n]*                            # line comment
+  | /\*.*?(?:\*/|$)                      # block comment
+  | (?P<numbered>\?\d+)
+  | (?P<positional>\?)
+  | (?<![\w$])[:@$](?P<named>[A-Za-z_][A-Za-z0-9_]*)
+""", re.VERBOSE | re.DOTALL)
+
+def find_parameters(sql):
+    positional = 0
+    numbered = 0
+    names = []
+    for match in SQL_TOKEN_PATTERN.finditer(sql):
+        if match.group('numbered'):
+            numbered = max(numbered, int(match.group('numbered')[1:]))
+        elif match.group('positional'):
+            positional += 1
+        elif match.group('named') and match.group('named') not in names:
+            names.append(match.group('named'))
+    return max(positional, numbered), names
+
+def coerce_parameter(text):
+    if text == 'NULL':
+        return None
+    if re.fullmatch(r'-?(0|[1-9]\d*)', text):
+        return int(text)
+    if re.fullmatch(r'-?(0|[1-9]\d*)\.\d+([eE][+-]?\d+)?', text):
+        return float(text)
+    return text
+
+def iter_parameter_rows(rows, positional, names, header):
+    rows = iter(rows)
+    indexes = list(range(positional or len(names)))
+    if header:
+        columns = next(rows, [])
+        if names and all(name in columns for name in names):
+            indexes = [columns.index(name) for name in names]
+    for line_no, row in enumerate(rows, 2 if header else 1):
+        if not row:
+            continue
+        if len(row) <= max(indexes, default=-1):
+            raise ValueError(f"Row {line_no} has {len(row)} values, {len(indexes)} parameters are needed")
+        values = [coerce_parameter(row[i]) for i in indexes]
+        yield dict(zip(names, values)) if names else values
+
+def bind_script_parameters(statements, values):
+    bound = []
+    offset = 0
+    for sql in statements:
+        positional, names = find_parameters(sql)
+        if isinstance(values, dict):
+            bound.append((sql, {name: values[name] for name in names}))
+        else:
+            bound.append((sql, values[offset:offset + positional]))
+            offset += positional
+    return bound
+
+def time_statements(conn, bound):
+    cursor = conn.cursor()
+    rows = 0
+    cursor.execute("BEGIN")
+    started = time.perf_counter()
+    try:
+        for sql, params in bound:
+            cursor.execute(sql, params)
+            if cursor.description:
+                while True:
+                    batch = cursor.fetchmany(RESULT_FETCH_SIZE)
+                    if not batch:
+                        break
+                    rows += len(batch)
+        return time.perf_counter() - started, rows
+    finally:
+        conn.rollback()
+
+def summarize_timings(timings, rows):
+    ordered = sorted(timings)
+    mid = len(ordered) // 2
+    median = ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    return {
+        'runs': len(ordered),
+        'min': ordered[0],
+        'median': median,
+        'p95': ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)],
+        'max': ordered[-1],
+        'rows': rows,
+        'rows_per_sec': rows / median if median > 0 else None
+    }
+
+FILTER_OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'between', 'in', 'starts with', 'is null', 'is not null')
+
+def column_affinity(declared_type):
+    declared = (declared_type or '').upper()
+    if 'INT' in declared:
+        return 'INTEGER'
+    if any(name in declared for name in ('CHAR', 'CLOB', 'TEXT')):
+        return 'TEXT'
+    if 'BLOB' in declared or not declared:
+        return 'BLOB'
+    if any(name in declared for name in ('REAL', 'FLOA', 'DOUB')):
+        return 'REAL'
+    return 'NUMERIC'
+
+def typed_filter_value(text, affinity):
+    if affinity == 'TEXT':
+        return text
+    value = coerce_parameter(text.strip())
+    if affinity == 'REAL' and isinstance(value, int):
+        return float(value)
+    return value
+
+def build_filter_clause(conditions, affinities, match_all=True):
+    clauses = []
+    params = []
+    for column, op, value, value2 in conditions:
+        col = quote_identifier(column)
+        affinity = affinities[column]
+        if op == 'is null':
+            clauses.append(f"{col} IS NULL")
+        elif op == 'is not null':
+            clauses.append(f"{col} IS NOT NULL")
+        elif op == 'between':
+            clauses.append(f"{col} BETWEEN ? AND ?")
+            params += [typed_filter_value(value, affinity), typed_filter_value(value2, affinity)]
+        elif op == 'in':
+            items = next(csv.reader([value], skipinitialspace=True), [])
+            if not items:
+                raise ValueError(f"{column}: enter a comma-separated list of values")
+            clauses.append(f"{col} IN ({', '.join('?' * len(items))})")
+            params += [typed_filter_value(item, affinity) for item in items]
+        elif op == 'starts with':
+            if not value:
+                raise ValueError(f"{column}: enter a prefix")
+            if affinity == 'TEXT':
+                clauses.append(f"{col} >= ? AND {col} < ?")
+                params += [value, value[:-1] + chr(ord(value[-1]) + 1)]
+            else:
+                clauses.append(f"CAST({col} AS TEXT) GLOB ?")
+                params.append(re.sub(r'([*?\[])', r'[\1]', value) + '*')
+        else:
+            clauses.append(f"{col} {op} ?")
+            params.append(typed_filter_value(value, affinity))
+            
+    if match_all:
+        return " AND ".join(clauses), params
+    return " OR ".join(f"({clause})" for clause in clauses), params
+
+class ObjectIndex:
+    def __init__(self, entries):
+        self.names = [name for name, _, _ in entries]
+        self.tables = [name for name, kind, _ in entries if kind == 'table']
+        self.lower = [name.lower().replace('\n', ' ') for name in self.names]
+        self.exact = {}
+        for i, name in enumerate(self.lower):
+            self.exact.setdefault(name, []).append(i)
+        
+        self.name_blob, self.name_starts = self.build_blob(self.lower)
+        self.line_at = {offset: i for i, offset in enumerate(self.name_starts)}
+        self.column_blob, self.column_starts = self.build_blob(
+            " ".join(columns).lower().replace('\n', ' ') for _, _, columns in entries)
+        
+        positions = {}
+        for i, name in enumerate(self.lower):
+            for char in set(name):
+                positions.setdefault(char, []).append(i)
+        self.char_masks = {}
+        for char, indexes in positions.items():
+            bits = bytearray((len(self.names) >> 3) + 1)
+            for i in indexes:
+                bits[i >> 3] |= 1 << (i & 7)
+            self.char_masks[char] = int.from_bytes(bits, 'little')
+    
+    @staticmethod
+    def build_blob(lines):
+        starts = []
+        offset = 0
+        parts = []
+        for line in lines:
+            starts.append(offset)
+            parts.append(line)
+            offset += len(line) + 1
+        return "\n" + "\n".join(parts) + "\n", starts
+    
+    def substring_lines(self, pattern, blob, starts):
+        for match in re.finditer(pattern, blob):
+            yield bisect.bisect_right(starts, match.start()) - 1
+    
+    def fuzzy_lines(self, term):
+        mask = -1
+        for char in set(term):
+            mask &= self.char_masks.get(char, 0)
+            if not mask:
+                return
+        # [^c]*c takes the earliest occurrence of each char, so a miss fails without backtracking
+        matcher = re.compile("".join(f"[^{re.escape(char)}]*{re.escape(char)}" for char in term)).match
+        bits = bin(mask)[:1:-1]
+        i = bits.find('1')
+        while i >= 0:
+            if matcher(self.lower[i]):
+                yield i
+            i = bits.find('1', i + 1)
+    
+    def search(self, term, limit):
+        escaped = re.escape(term)
+        ranked = itertools.chain(
+            self.exact.get(term, ()),
+            (self.line_at[match.start()] for match in re.finditer("\n" + escaped, self.name_blob)),
+            self.substring_lines(escaped, self.name_blob, self.name_starts),
+            self.fuzzy_lines(term),
+            self.substring_lines(escaped, self.column_blob, self.column_starts))
+        
+        found = []
+        seen = set()
+        for i in ranked:
+            if i not in seen:
+                seen.add(i)
+                found.append(self.names[i])
+                if len(found) == limit:
+                    return found, True
+        return found, False
+
+def shadow_tables(cursor):
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND sql LIKE 'CREATE VIRTUAL TABLE%'")
+    return {f"{name}{suffix}" for (name,) in cursor.fetchall() for suffix in SHADOW_TABLE_SUFFIXES}
+
+def write_sql_dump(conn, out, tables, rows_per_insert, task):
+    cursor = conn.cursor()
+    read_cursor = conn.cursor()
+    total_rows = 0
+    # Shadow tables are recreated by CREATE VIRTUAL TABLE and refilled by its inserts
+    shadows = shadow_tables(cursor)
+    tables = [table for table in tables if table not in shadows]
+    
+    out.write("PRAGMA foreign_keys=OFF;\nBEGIN TRANSACTION;\n")
+    
+    for i, table in enumerate(tables):
+        task.check_cancelled()
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name = ?", (table,))
+        create_sql = cursor.fetchone()[0]
+        out.write(f"{create_sql};\n")
+        
+        cursor.execute(f"PRAGMA table_xinfo({quote_identifier(table)})")
+        columns = ",".join(quote_identifier(col[1]) for col in cursor.fetchall() if col[6] == 0)
+        prefix = f"INSERT INTO {quote_identifier(table)} ({columns}) VALUES"
+        read_cursor.execute(f"SELECT {columns} FROM {quote_identifier(table)}")
+        table_rows = 0
+        while True:
+            rows = read_cursor.fetchmany(rows_per_insert)
+            if not rows:
+                break
+            values = ",".join("(" + ",".join(map(sql_literal, row)) + ")" for row in rows)
+            out.write(f"{prefix}{values};\n")
+            table_rows += len(rows)
+            task.check_cancelled()
+            task.report(f"Table {i + 1} of {len(tables)}: {table} ({table_rows:,} rows)", i / len(tables))
+        total_rows += table_rows
+        
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_sequence'")
+    if cursor.fetchone():
+        placeholders = ','.join('?' for _ in tables)
+        cursor.execute(f"SELECT name, seq FROM sqlite_sequence WHERE name IN ({placeholders})", tables)
+        sequences = cursor.fetchall()
+        if sequences:
+            names = ",".join(sql_literal(name) for name, _ in sequences)
+            out.write(f"DELETE FROM sqlite_sequence WHERE name IN ({names});\n")
+            values = ",".join(f"({sql_literal(name)},{seq})" for name, seq in sequences)
+            out.write(f"INSERT INTO sqlite_sequence VALUES{values};\n")
+            
+    placeholders = ','.join('?' for _ in tables)
+    cursor.execute(f"SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL "
+                   f"AND tbl_name IN ({placeholders}) ORDER BY type, name", tables)
+    for (sql,) in cursor.fetchall():
+        out.write(f"{sql};\n")
+        
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+    if len({name for (name,) in cursor.fetchall()} - shadows) == len(tables):
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type='view' AND sql IS NOT NULL ORDER BY rowid")
+        for (sql,) in cursor.fetchall():
+            out.write(f"{sql};\n")
+            
+    out.write("COMMIT;\n")
+    return total_rows
+
+def export_value(value):
+    return value.hex() if isinstance(value, bytes) else value
+
+def write_query_results(conn, out, bound, fmt, task):
+    cursor = conn.cursor()
+    written = 0
+    started = last_report = time.time()
+    
+    cursor.execute("BEGIN")
+    try:
+        for sql, params in bound:
+            cursor.execute(sql, params)
+        if not cursor.description:
+            raise ValueError("The last statement does not return rows")
+        columns = [desc[0] for desc in cursor.description]
+        
+        if fmt == 'csv':
+            writer = csv.writer(out)
+            writer.writerow(columns)
+        elif fmt == 'json':
+            out.write("[")
+        
+        while True:
+            rows = cursor.fetchmany(RESULT_FETCH_SIZE)
+            if not rows:
+                break
+            if fmt == 'csv':
+                writer.writerows([export_value(value) for value in row] for row in rows)
+            else:
+                lines = [json.dumps(dict(zip(columns, map(export_value, row))), ensure_ascii=False) for row in rows]
+                if fmt == 'ndjson':
+                    out.write("\n".join(lines) + "\n")
+                else:
+                    out.write((",\n  " if written else "\n  ") + ",\n  ".join(lines))
+            written += len(rows)
+            
+            now = time.time()
+            if now - last_report >= 0.2:
+                task.check_cancelled()
+                last_report = now
+                task.report(f"{written:,} rows written | {written / max(now - started, 1e-6):,.0f} rows/s")
+        
+        if fmt == 'json':
+            out.write("\n]\n" if written else "]\n")
+        return written, time.time() - started
+    finally:
+        conn.rollback()
 
 class SQLiteManager(tk.Tk):
+    db_path = workspace_attribute('db_path')
+    conn = workspace_attribute('conn')
+    cursor = workspace_attribute('cursor')
+    current_table = workspace_attribute('current_table')
+    attached = workspace_attribute('attached')
+    pending_changes = workspace_attribute('pending_changes')
+    data_where = workspace_attribute('data_where')
+    data_params = workspace_attribute('data_params')
+    data_order = workspace_attribute('data_order')
+    data_rowid = workspace_attribute('data_rowid')
+    select_all_matching = workspace_attribute('select_all_matching')
+    data_sample = workspace_attribute('data_sample')
+    data_columns = workspace_attribute('data_columns')
+    data_truncated = workspace_attribute('data_truncated')
+    data_values = workspace_attribute('data_values')
+    object_index = workspace_attribute('object_index')
+    data_window = workspace_attribute('data_window')
+    rowid_histograms = workspace_attribute('rowid_histograms')
+    data_filter = workspace_attribute('data_filter')
+    checkpoint_policy = workspace_attribute('checkpoint_policy')
+    analyze_policy = workspace_attribute('analyze_policy')
+    query_tab = workspace_attribute('query_tab')
+    query_text = workspace_attribute('query_text')
+    line_numbers = workspace_attribute('line_numbers')
+    template_combo = workspace_attribute('template_combo')
+    result_notebook = workspace_attribute('result_notebook')
+    statement_tree = workspace_attribute('statement_tree')
+    result_label = workspace_attribute('result_label')
+    result_page_label = workspace_attribute('result_page_label')
+    result_filter_entry = workspace_attribute('result_filter_entry')
+    result_sets = workspace_attribute('result_sets')
+    script_transaction_var = workspace_attribute('script_transaction_var')
+    stop_on_error_var = workspace_attribute('stop_on_error_var')
+    param_grid = workspace_attribute('param_grid')
+    param_entries = workspace_attribute('param_entries')
+    param_source = workspace_attribute('param_source')
+    param_source_label = workspace_attribute('param_source_label')
+    each_row_var = workspace_attribute('each_row_var')
+    param_header_var = workspace_attribute('param_header_var')
+    
     def __init__(self):
         super().__init__()
         
@@ -14,17 +1693,25 @@ class SQLiteManager(tk.Tk):
         self.geometry("1400x900")
         self.minsize(1000, 600)
         
-        self.db_path = None
-        self.conn = None
-        self.cursor = None
+        self.workspace = Workspace("Workspace 1")
+        self.workspaces = [self.workspace]
         self.query_history = []
-        self.current_table = None
+        self.result_memory_budget = RESULT_MEMORY_BUDGET
+        self.watch_var = tk.BooleanVar(value=True)
+        self.optimize_var = tk.BooleanVar(value=True)
+        self.analysis_limit = ANALYSIS_LIMIT
+        self.table_list_items = []
+        self.search_job = None
         
         self.configure(bg="#1e1e1e")
         self.setup_styles()
         self.create_menu()
         self.create_widgets()
         self.create_statusbar()
+        self.after(WATCH_INTERVAL_MS, self.watch_database)
+        self.after(CHECKPOINT_POLL_MS, self.run_checkpoint_policies)
+        self.after(ANALYZE_POLL_MS, self.run_analyze_policies)
+        self.protocol("WM_DELETE_WINDOW", self.exit_app)
         
     def setup_styles(self):
         style = ttk.Style()
@@ -64,10 +1751,17 @@ class SQLiteManager(tk.Tk):
         file_menu.add_command(label="Open...", command=self.open_database, accelerator="Ctrl+O")
         file_menu.add_command(label="Close", command=self.close_database)
         file_menu.add_separator()
+        file_menu.add_command(label="New Workspace", command=self.new_workspace)
+        file_menu.add_command(label="Open in New Workspace...", command=self.open_in_new_workspace)
+        file_menu.add_command(label="Close Workspace", command=self.close_workspace)
+        file_menu.add_separator()
+        file_menu.add_command(label="Attach Database...", command=self.attach_database)
+        file_menu.add_command(label="Detach Database...", command=self.detach_database)
+        file_menu.add_separator()
         file_menu.add_command(label="Export", command=self.export_menu)
         file_menu.add_command(label="Import", command=self.import_menu)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.quit, accelerator="Alt+F4")
+        file_menu.add_command(label="Exit", command=self.exit_app, accelerator="Alt+F4")
         menubar.add_cascade(label="File", menu=file_menu)
         
       
@@ -78,6 +1772,7 @@ class SQLiteManager(tk.Tk):
         table_menu.add_command(label="Truncate Table", command=self.truncate_table)
         table_menu.add_separator()
         table_menu.add_command(label="Table Info", command=self.show_table_info)
+        table_menu.add_command(label="Profile Columns", command=self.profile_columns)
         menubar.add_cascade(label="Tables", menu=table_menu)
         
        
@@ -85,6 +1780,9 @@ class SQLiteManager(tk.Tk):
 							activebackground="#0078d4", activeforeground="white")
         query_menu.add_command(label="Execute Query", command=self.execute_query, accelerator="F5")
         query_menu.add_command(label="Query History", command=self.show_query_history)
+        query_menu.add_command(label="Benchmark...", command=self.benchmark_query)
+        query_menu.add_command(label="Export Results...", command=self.export_query_results)
+        query_menu.add_command(label="Result Memory Budget...", command=self.set_result_memory_budget)
         query_menu.add_command(label="Cancel", command=self.clear_query)
         menubar.add_cascade(label="Query", menu=query_menu)
         
@@ -94,6 +1792,11 @@ class SQLiteManager(tk.Tk):
         tools_menu.add_command(label="VACUUM", command=self.vacuum_db)
         tools_menu.add_command(label="Integrity Check", command=self.integrity_check)
         tools_menu.add_command(label="Database Info", command=self.show_db_info)
+        tools_menu.add_command(label="WAL Checkpoints...", command=self.show_wal_panel)
+        tools_menu.add_command(label="Planner Statistics...", command=self.show_planner_stats)
+        tools_menu.add_separator()
+        tools_menu.add_checkbutton(label="Watch for External Changes", variable=self.watch_var)
+        tools_menu.add_checkbutton(label="Optimize on Close and After Imports", variable=self.optimize_var)
         menubar.add_cascade(label="Tools", menu=tools_menu)
         
      
@@ -123,6 +1826,10 @@ class SQLiteManager(tk.Tk):
         db_info_frame = ttk.LabelFrame(left_frame, text="Database", padding=10)
         db_info_frame.pack(fill=tk.X, padx=5, pady=5)
         
+        self.workspace_combo = ttk.Combobox(db_info_frame, state='readonly')
+        self.workspace_combo.pack(fill=tk.X, pady=(0, 5))
+        self.workspace_combo.bind('<<ComboboxSelected>>', self.on_workspace_select)
+        
         self.db_label = ttk.Label(db_info_frame, text="No database loaded", 
                                   wraplength=220, foreground="#888888")
         self.db_label.pack()
@@ -172,6 +1879,7 @@ class SQLiteManager(tk.Tk):
       
         self.notebook = ttk.Notebook(right_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_notebook_tab_changed)
         
     
         self.data_tab = ttk.Frame(self.notebook)
@@ -187,6 +1895,7 @@ class SQLiteManager(tk.Tk):
         self.schema_tab = ttk.Frame(self.notebook)
         self.notebook.add(self.schema_tab, text="🏗️ Schema")
         self.create_schema_tab()
+        self.update_workspace_list()
         
     def create_data_tab(self):
         
@@ -201,6 +1910,17 @@ class SQLiteManager(tk.Tk):
         
         ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
         
+        ttk.Button(toolbar, text="💾 Commit", command=self.commit_pending_changes).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="↩️ Revert", command=self.revert_pending_changes).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
+        
+        ttk.Button(toolbar, text="☑️ Select All", command=self.select_all_rows).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="🧮 Set Value", command=self.bulk_set_value).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
+        
+        ttk.Button(toolbar, text="🔍 View Cell", command=self.show_cell_viewer).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="📤 Export", command=self.export_table).pack(side=tk.LEFT, padx=2)
         
      
@@ -213,6 +1933,26 @@ class SQLiteManager(tk.Tk):
         self.filter_entry.pack(side=tk.LEFT, ipady=3)
         self.filter_entry.bind('<Return>', lambda e: self.apply_filter())
         ttk.Button(filter_frame, text="Filter", command=self.apply_filter).pack(side=tk.LEFT, padx=2)
+        ttk.Button(filter_frame, text="🧰 Builder...", command=self.filter_builder).pack(side=tk.LEFT, padx=2)
+        
+        view_bar = ttk.Frame(self.data_tab)
+        view_bar.pack(fill=tk.X, padx=5)
+        
+        self.sample_var = tk.BooleanVar()
+        ttk.Checkbutton(view_bar, text="🎲 Sample", variable=self.sample_var,
+                        command=self.toggle_sample_mode).pack(side=tk.LEFT, padx=2)
+        ttk.Label(view_bar, text="Rows:").pack(side=tk.LEFT, padx=(5, 2))
+        self.sample_size_spin = ttk.Spinbox(view_bar, from_=10, to=1000000, increment=100, width=8)
+        self.sample_size_spin.set(1000)
+        self.sample_size_spin.pack(side=tk.LEFT, padx=2)
+        ttk.Button(view_bar, text="Resample", command=self.toggle_sample_mode).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Separator(view_bar, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
+        
+        ttk.Button(view_bar, text="⤵ Go To...", command=self.go_to_row).pack(side=tk.LEFT, padx=2)
+        ttk.Button(view_bar, text="◀", width=3, command=lambda: self.page_data_window(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(view_bar, text="▶", width=3, command=lambda: self.page_data_window(1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(view_bar, text="All Rows", command=self.close_data_window).pack(side=tk.LEFT, padx=2)
         
         
         tree_frame = ttk.Frame(self.data_tab)
@@ -226,13 +1966,16 @@ class SQLiteManager(tk.Tk):
         hsb.pack(side=tk.BOTTOM, fill=tk.X)
         
         self.data_tree = ttk.Treeview(tree_frame, yscrollcommand=vsb.set, 
-                                      xscrollcommand=hsb.set, selectmode='browse')
+                                      xscrollcommand=hsb.set, selectmode='extended')
         self.data_tree.pack(fill=tk.BOTH, expand=True)
         
         vsb.config(command=self.data_tree.yview)
         hsb.config(command=self.data_tree.xview)
         
-        self.data_tree.bind('<Double-1>', lambda e: self.edit_row())
+        self.data_tree.tag_configure('pending', background="#4d3d00")
+        self.data_tree.bind('<Double-1>', self.start_inline_edit)
+        self.data_tree.bind('<Control-a>', lambda e: self.select_all_rows())
+        self.data_tree.bind('<<TreeviewSelect>>', lambda e: self.update_row_count_label())
         
        
         self.row_count_label = ttk.Label(self.data_tab, text="No data")
@@ -249,6 +1992,16 @@ class SQLiteManager(tk.Tk):
         ttk.Button(toolbar, text="📜 History", command=self.show_query_history).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="💾 Save", command=self.save_query).pack(side=tk.LEFT, padx=2)
         ttk.Button(toolbar, text="📂 Load", command=self.load_query).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="⏱ Benchmark", command=self.benchmark_query).pack(side=tk.LEFT, padx=2)
+        ttk.Button(toolbar, text="📤 Export Results", command=self.export_query_results).pack(side=tk.LEFT, padx=2)
+        
+        ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, fill=tk.Y, padx=5)
+        
+        self.script_transaction_var = tk.BooleanVar()
+        ttk.Checkbutton(toolbar, text="Single transaction",
+                        variable=self.script_transaction_var).pack(side=tk.LEFT, padx=2)
+        self.stop_on_error_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(toolbar, text="Stop on error", variable=self.stop_on_error_var).pack(side=tk.LEFT, padx=2)
         
        
         template_frame = ttk.Frame(toolbar)
@@ -287,27 +2040,69 @@ class SQLiteManager(tk.Tk):
         
         self.query_text.bind('<KeyRelease>', self.update_line_numbers)
         self.query_text.bind('<KeyRelease>', self.syntax_highlight, add='+')
+        self.query_text.bind('<KeyRelease>', self.update_parameter_panel, add='+')
+        
+        param_frame = ttk.LabelFrame(self.query_tab, text="Parameters", padding=5)
+        param_frame.pack(fill=tk.X, padx=5)
+        
+        param_bar = ttk.Frame(param_frame)
+        param_bar.pack(fill=tk.X)
+        
+        self.each_row_var = tk.BooleanVar()
+        ttk.Checkbutton(param_bar, text="Run for each row", variable=self.each_row_var).pack(side=tk.LEFT, padx=2)
+        self.param_header_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(param_bar, text="Header row", variable=self.param_header_var).pack(side=tk.LEFT, padx=2)
+        ttk.Button(param_bar, text="📂 Load CSV", command=self.load_parameter_csv).pack(side=tk.LEFT, padx=2)
+        ttk.Button(param_bar, text="📋 Paste Grid", command=self.paste_parameter_grid).pack(side=tk.LEFT, padx=2)
+        self.param_source_label = ttk.Label(param_bar, text="No rows loaded", foreground="#888888")
+        self.param_source_label.pack(side=tk.LEFT, padx=5)
+        ttk.Label(param_bar, text="NULL binds NULL, plain numbers bind as numbers",
+                  foreground="#888888").pack(side=tk.RIGHT, padx=5)
+        
+        self.param_grid = ttk.Frame(param_frame)
+        self.param_grid.pack(fill=tk.X, pady=(5, 0))
+        self.update_parameter_panel()
         
        
         result_frame = ttk.LabelFrame(self.query_tab, text="Result", padding=5)
         result_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        result_bar = ttk.Frame(result_frame)
+        result_bar.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Button(result_bar, text="◀ Prev", command=lambda: self.page_results(-1)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(result_bar, text="Next ▶", command=lambda: self.page_results(1)).pack(side=tk.LEFT, padx=2)
+        self.result_page_label = ttk.Label(result_bar, text="", foreground="#888888")
+        self.result_page_label.pack(side=tk.LEFT, padx=5)
+        ttk.Button(result_bar, text="Filter", command=self.filter_results).pack(side=tk.RIGHT, padx=2)
+        self.result_filter_entry = tk.Entry(result_bar, width=20, bg="#2d2d2d", fg="white",
+                                            insertbackground="white", relief=tk.FLAT)
+        self.result_filter_entry.pack(side=tk.RIGHT, ipady=3)
+        self.result_filter_entry.bind('<Return>', lambda e: self.filter_results())
+        ttk.Label(result_bar, text="Filter:").pack(side=tk.RIGHT, padx=5)
+        
       
-        result_tree_frame = ttk.Frame(result_frame)
-        result_tree_frame.pack(fill=tk.BOTH, expand=True)
+        self.result_notebook = ttk.Notebook(result_frame)
+        self.result_notebook.pack(fill=tk.BOTH, expand=True)
+        self.result_notebook.bind('<<NotebookTabChanged>>', lambda e: self.update_result_page_label())
         
-        result_vsb = ttk.Scrollbar(result_tree_frame, orient="vertical")
-        result_vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        statement_frame = ttk.Frame(self.result_notebook)
+        self.result_notebook.add(statement_frame, text="Statements")
         
-        result_hsb = ttk.Scrollbar(result_tree_frame, orient="horizontal")
-        result_hsb.pack(side=tk.BOTTOM, fill=tk.X)
+        statement_vsb = ttk.Scrollbar(statement_frame, orient="vertical")
+        statement_vsb.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.result_tree = ttk.Treeview(result_tree_frame, yscrollcommand=result_vsb.set,
-                                        xscrollcommand=result_hsb.set)
-        self.result_tree.pack(fill=tk.BOTH, expand=True)
+        self.statement_tree = ttk.Treeview(statement_frame, yscrollcommand=statement_vsb.set,
+                                           columns=('#', 'Line', 'Statement', 'Time', 'Rows', 'Status'))
+        self.statement_tree.pack(fill=tk.BOTH, expand=True)
+        statement_vsb.config(command=self.statement_tree.yview)
         
-        result_vsb.config(command=self.result_tree.yview)
-        result_hsb.config(command=self.result_tree.xview)
+        self.statement_tree.column('#0', width=0, stretch=tk.NO)
+        for col, width in (('#', 40), ('Line', 50), ('Statement', 380), ('Time', 90), ('Rows', 120), ('Status', 260)):
+            self.statement_tree.column(col, width=width, stretch=col in ('Statement', 'Status'))
+            self.statement_tree.heading(col, text='Time (ms)' if col == 'Time' else col)
+        self.statement_tree.tag_configure('error', foreground="#f48771")
+        self.statement_tree.bind('<Double-1>', self.show_statement_result)
         
         self.result_label = ttk.Label(result_frame, text="No query executed")
         self.result_label.pack(pady=5)
@@ -374,11 +2169,22 @@ class SQLiteManager(tk.Tk):
     def open_database_file(self, file_path):
         try:
             if self.conn:
+                self.optimize_connection(self.workspace)
                 self.conn.close()
                 
-            self.conn = sqlite3.connect(file_path)
+            self.conn = sqlite3.connect(file_path, cached_statements=STATEMENT_CACHE_SIZE)
             self.cursor = self.conn.cursor()
             self.db_path = file_path
+            self.workspace.name = os.path.basename(file_path)
+            self.update_workspace_list()
+            self.attached = {}
+            self.data_sample = None
+            self.workspace.watch_files = None
+            self.workspace.watch_versions = None
+            self.data_window = None
+            self.rowid_histograms = {}
+            self.checkpoint_policy = None
+            self.analyze_policy = None
             
             self.db_label.config(text=os.path.basename(file_path), foreground="white")
             self.refresh_tables()
@@ -390,74 +2196,351 @@ class SQLiteManager(tk.Tk):
             
     def close_database(self):
         if self.conn:
+            self.optimize_connection(self.workspace)
             self.conn.close()
             self.conn = None
             self.cursor = None
             self.db_path = None
             self.db_label.config(text="No database loaded", foreground="#888888")
-            self.table_listbox.delete(0, tk.END)
+            self.pending_changes.clear()
+            self.attached = {}
+            self.data_sample = None
+            self.workspace.watch_files = None
+            self.workspace.watch_versions = None
+            self.object_index = None
+            self.checkpoint_policy = None
+            self.analyze_policy = None
+            self.update_table_list([])
             self.clear_tree(self.data_tree)
             self.clear_tree(self.schema_tree)
             self.set_status("Database closed")
             
+    def new_workspace(self):
+        if not self.confirm_discard_pending():
+            return False
+            
+        number = len(self.workspaces) + 1
+        while any(ws.name == f"Workspace {number}" for ws in self.workspaces):
+            number += 1
+        self.workspace = Workspace(f"Workspace {number}")
+        self.workspaces.append(self.workspace)
+        
+        self.query_tab = ttk.Frame(self.notebook)
+        self.notebook.insert(self.schema_tab, self.query_tab, text="⚡ SQL Query")
+        self.create_query_tab()
+        self.update_workspace_list()
+        self.show_workspace()
+        return True
+        
+    def open_in_new_workspace(self):
+        file_path = filedialog.askopenfilename(
+            title="Open Database in New Workspace",
+            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")]
+        )
+        if file_path and self.new_workspace():
+            self.open_database_file(file_path)
+            
+    def close_workspace(self):
+        if len(self.workspaces) == 1:
+            self.close_database()
+            return
+            
+        if not self.confirm_discard_pending():
+            return
+            
+        workspace = self.workspace
+        self.clear_results()
+        self.close_database()
+        workspace.shutdown()
+        index = self.workspaces.index(workspace)
+        self.workspaces.remove(workspace)
+        self.notebook.forget(workspace.query_tab)
+        
+        self.workspace = self.workspaces[min(index, len(self.workspaces) - 1)]
+        self.update_workspace_list()
+        self.show_workspace()
+        self.set_status(f"Workspace closed: {workspace.name}")
+        
+    def switch_workspace(self, workspace):
+        if workspace is self.workspace:
+            return True
+        if not self.confirm_discard_pending():
+            self.update_workspace_list()
+            if any(str(ws.query_tab) == str(self.notebook.select()) for ws in self.workspaces):
+                self.notebook.select(self.query_tab)
+            return False
+            
+        self.workspace = workspace
+        self.update_workspace_list()
+        self.show_workspace()
+        self.set_status(f"Workspace: {workspace.name}")
+        return True
+        
+    def on_workspace_select(self, event=None):
+        index = self.workspace_combo.current()
+        if 0 <= index < len(self.workspaces):
+            self.switch_workspace(self.workspaces[index])
+            
+    def on_notebook_tab_changed(self, event=None):
+        selected = self.notebook.select()
+        for workspace in self.workspaces:
+            if workspace.query_tab is not None and str(workspace.query_tab) == str(selected):
+                self.switch_workspace(workspace)
+                return
+                
+    def update_workspace_list(self):
+        names = [ws.name for ws in self.workspaces]
+        self.workspace_combo['values'] = names
+        self.workspace_combo.current(self.workspaces.index(self.workspace))
+        for ws in self.workspaces:
+            text = "⚡ SQL Query" if len(self.workspaces) == 1 else f"⚡ SQL: {ws.name}"
+            self.notebook.tab(ws.query_tab, text=text)
+            
+    def show_workspace(self):
+        selected = self.notebook.select()
+        if any(str(ws.query_tab) == str(selected) for ws in self.workspaces):
+            self.notebook.select(self.query_tab)
+            
+        if self.conn:
+            self.db_label.config(text=os.path.basename(self.db_path), foreground="white")
+        else:
+            self.db_label.config(text="No database loaded", foreground="#888888")
+            
+        self.update_table_list([])
+        self.clear_tree(self.schema_tree)
+        self.clear_tree(self.data_tree)
+        self.row_count_label.config(text="No data")
+        if not self.conn:
+            return
+            
+        self.refresh_tables()
+        self.refresh_schema()
+        if self.current_table:
+            self.sample_var.set(self.data_sample is not None)
+            self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+            
+    def attach_database(self):
+        if not self.conn:
+            messagebox.showwarning("Warning", "Please open a database first.")
+            return
+            
+        file_path = filedialog.askopenfilename(
+            title="Attach Database",
+            filetypes=[("SQLite Database", "*.db"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+            
+        default = re.sub(r'\W', '_', os.path.splitext(os.path.basename(file_path))[0])
+        if not default or default[0].isdigit():
+            default = f"db_{default}"
+        alias = simpledialog.askstring("Attach Database", "Schema alias:", initialvalue=default, parent=self)
+        if not alias:
+            return
+            
+        taken = {'main', 'temp'} | {name.lower() for name in self.attached}
+        if not re.fullmatch(r'[A-Za-z_]\w*', alias) or alias.lower() in taken:
+            messagebox.showerror("Error", f"Invalid or already used alias: {alias}")
+            return
+            
+        try:
+            self.cursor.execute(f"ATTACH DATABASE ? AS {alias}", (file_path,))
+        except Exception as e:
+            messagebox.showerror("Error", f"Database could not be attached:\n{e}")
+            return
+            
+        self.sync_attached()
+        self.refresh_tables()
+        self.refresh_schema()
+        self.set_status(f"Database attached as {alias}: {os.path.basename(file_path)}")
+        
+    def detach_database(self):
+        if not self.attached:
+            messagebox.showinfo("Info", "No databases are attached.")
+            return
+            
+        alias = simpledialog.askstring("Detach Database", f"Alias to detach ({', '.join(self.attached)}):",
+                                       initialvalue=next(iter(self.attached)), parent=self)
+        if not alias:
+            return
+        if alias not in self.attached:
+            messagebox.showerror("Error", f"No database is attached as {alias}")
+            return
+            
+        if self.current_table and self.split_table_name(self.current_table)[0] == alias:
+            if not self.confirm_discard_pending():
+                return
+                
+        try:
+            self.cursor.execute(f"DETACH DATABASE {alias}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Database could not be detached:\n{e}")
+            return
+            
+        self.sync_attached()
+        self.refresh_tables()
+        self.refresh_schema()
+        self.set_status(f"Database detached: {alias}")
+        
+    def sync_attached(self):
+        current_schema = self.current_table and self.split_table_name(self.current_table)[0]
+        self.cursor.execute("PRAGMA database_list")
+        self.attached = {name: path for _, name, path in self.cursor.fetchall() if name not in ('main', 'temp')}
+        
+        if current_schema and current_schema not in ('main', 'temp', *self.attached):
+            self.current_table = None
+            self.data_sample = None
+            self.pending_changes.clear()
+            self.clear_tree(self.data_tree)
+            self.row_count_label.config(text="No data")
+            
+    def split_table_name(self, table_name):
+        schema, sep, name = table_name.partition('.')
+        if sep and (schema in self.attached or schema in ('main', 'temp')):
+            return schema, name
+        return 'main', table_name
+        
+    def table_info(self, table_name):
+        schema, name = self.split_table_name(table_name)
+        self.cursor.execute(f"PRAGMA {schema}.table_info({name})")
+        return self.cursor.fetchall()
+        
+    def table_names(self):
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+        names = [row[0] for row in self.cursor.fetchall()]
+        for alias in self.attached:
+            self.cursor.execute(f"SELECT name FROM {alias}.sqlite_master WHERE type='table' ORDER BY name")
+            names.extend(f"{alias}.{row[0]}" for row in self.cursor.fetchall())
+        return names
+        
     def refresh_tables(self):
         if not self.conn:
             return
             
-        self.table_listbox.delete(0, tk.END)
         try:
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = self.cursor.fetchall()
-            for table in tables:
-                self.table_listbox.insert(tk.END, table[0])
+            entries = []
+            for schema in ('main', *self.attached):
+                prefix = "" if schema == 'main' else f"{schema}."
+                try:
+                    self.cursor.execute(f"SELECT m.name, m.type, p.name FROM {schema}.sqlite_master AS m "
+                                        f"LEFT JOIN pragma_table_info(m.name, '{schema}') AS p "
+                                        f"WHERE m.type IN ('table', 'view') ORDER BY m.name, p.cid")
+                    rows = self.cursor.fetchall()
+                except sqlite3.Error:
+                    self.cursor.execute(f"SELECT name, type, NULL FROM {schema}.sqlite_master "
+                                        f"WHERE type IN ('table', 'view') ORDER BY name")
+                    rows = self.cursor.fetchall()
+                for name, kind, column in rows:
+                    if not entries or entries[-1][0] != prefix + name:
+                        entries.append((prefix + name, kind, []))
+                    if column is not None:
+                        entries[-1][2].append(column)
+            self.object_index = ObjectIndex(entries)
         except Exception as e:
             messagebox.showerror("Error", f"Tables could not be loaded:\n{e}")
-            
+            return
+        self.search_tables()
+        
     def filter_tables(self, event=None):
-        if not self.conn:
+        if self.search_job:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DEBOUNCE_MS, self.search_tables)
+        
+    def search_tables(self):
+        self.search_job = None
+        if not self.conn or not self.object_index:
             return
             
         search_term = self.table_search.get().lower()
         if search_term == "search..." or not search_term:
-            self.refresh_tables()
+            self.update_table_list(self.object_index.tables)
             return
             
-        self.table_listbox.delete(0, tk.END)
-        try:
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = self.cursor.fetchall()
-            for table in tables:
-                if search_term in table[0].lower():
-                    self.table_listbox.insert(tk.END, table[0])
-        except Exception as e:
-            pass
-            
+        names, truncated = self.object_index.search(search_term, SEARCH_RESULT_LIMIT)
+        self.update_table_list(names)
+        if truncated:
+            self.set_status(f"Showing the first {SEARCH_RESULT_LIMIT} matches; keep typing to narrow the search")
+            
+    def update_table_list(self, names):
+        old = self.table_list_items
+        start = 0
+        while start < min(len(old), len(names)) and old[start] == names[start]:
+            start += 1
+        end = 0
+        while end < min(len(old), len(names)) - start and old[-1 - end] == names[-1 - end]:
+            end += 1
+            
+        if start < len(old) - end:
+            self.table_listbox.delete(start, len(old) - end - 1)
+        if start < len(names) - end:
+            self.table_listbox.insert(start, *names[start:len(names) - end])
+        self.table_list_items = list(names)
+        
+
     def on_table_select(self, event=None):
         selection = self.table_listbox.curselection()
         if not selection:
             return
             
+        if not self.confirm_discard_pending():
+            return
+            
         self.current_table = self.table_listbox.get(selection[0])
         self.load_table_data(self.current_table)
         self.set_status(f"Table loaded: {self.current_table}")
         
-    def load_table_data(self, table_name, where_clause=""):
+    def load_table_data(self, table_name, where_clause="", params=(), order_by=None):
         if not self.conn:
             return
             
         try:
-            query = f"SELECT * FROM {table_name}"
+            self.data_rowid = self.rowid_alias(table_name)
+            
+            schema, name = self.split_table_name(table_name)
+            self.cursor.execute(f"PRAGMA {schema}.table_xinfo({name})")
+            self.data_columns = [col[1] for col in self.cursor.fetchall() if col[6] != 1]
+            
+            conditions = []
+            if self.sample_var.get():
+                if not self.data_rowid:
+                    self.sample_var.set(False)
+                    messagebox.showwarning("Warning", f"{table_name} has no rowid; sample mode is only available for rowid tables.")
+                elif not self.data_sample or self.data_sample['table'] != table_name:
+                    self.draw_sample(table_name)
+            if not self.sample_var.get():
+                self.data_sample = None
+            if self.data_sample:
+                conditions.append(f"{self.data_rowid} IN (SELECT id FROM temp.sample_rowids)")
             if where_clause:
-                query += f" WHERE {where_clause}"
+                conditions.append(f"({where_clause})")
                 
-            self.cursor.execute(query)
-            rows = self.cursor.fetchall()
+            if self.data_window and self.data_window['table'] != table_name:
+                self.data_window = None
+            if self.data_window:
+                rows = self.fetch_data_window(table_name, conditions, params)
+            else:
+                query = f"SELECT {self.data_select_list()} FROM {table_name}"
+                if conditions:
+                    query += f" WHERE {' AND '.join(conditions)}"
+                if order_by:
+                    query += f" ORDER BY {order_by}"
+                    
+                self.cursor.execute(query, params)
+                rows = self.cursor.fetchall()
+            
+            self.data_where = where_clause
+            self.data_params = tuple(params)
+            self.data_order = order_by
             
           
-            column_names = [description[0] for description in self.cursor.description]
+            column_names = self.data_columns
             
            
             self.clear_tree(self.data_tree)
+            self.pending_changes.clear()
+            self.data_truncated.clear()
+            self.data_values.clear()
+            self.select_all_matching = False
             self.data_tree['columns'] = column_names
             self.data_tree.column('#0', width=0, stretch=tk.NO)
             
@@ -466,9 +2549,9 @@ class SQLiteManager(tk.Tk):
                 self.data_tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
         
             for row in rows:
-                self.data_tree.insert('', tk.END, values=row)
+                self.insert_data_row(row)
                 
-            self.row_count_label.config(text=f"Rows: {len(rows)} | Columns: {len(column_names)}")
+            self.update_row_count_label()
             
         except Exception as e:
             messagebox.showerror("Error", f"Data could not be loaded:\n{e}")
@@ -477,41 +2560,665 @@ class SQLiteManager(tk.Tk):
         if not self.current_table:
             return
             
-        try:
-            self.cursor.execute(f"SELECT * FROM {self.current_table} ORDER BY {col}")
-            rows = self.cursor.fetchall()
+        if not self.confirm_discard_pending():
+            return
             
-            self.clear_tree(self.data_tree)
-            for row in rows:
-                self.data_tree.insert('', tk.END, values=row)
-        except Exception as e:
-            messagebox.showerror("Error", f"Sorting failed:\n{e}")
+        self.data_window = None
+        self.load_table_data(self.current_table, self.data_where, self.data_params, col)
             
     def apply_filter(self):
         if not self.current_table:
             return
             
+        if not self.confirm_discard_pending():
+            return
+            
         filter_text = self.filter_entry.get()
         if not filter_text:
-            self.load_table_data(self.current_table)
+            self.load_table_data(self.current_table, order_by=self.data_order)
             return
             
         try:
         
-            self.cursor.execute(f"PRAGMA table_info({self.current_table})")
-            columns = [col[1] for col in self.cursor.fetchall()]
+            columns = [col[1] for col in self.table_info(self.current_table)]
             
-            where_parts = [f"{col} LIKE '%{filter_text}%'" for col in columns]
+            where_parts = [f"{col} LIKE ?" for col in columns]
             where_clause = " OR ".join(where_parts)
             
-            self.load_table_data(self.current_table, where_clause)
+            self.load_table_data(self.current_table, where_clause, [f"%{filter_text}%"] * len(columns),
+                                 self.data_order)
         except Exception as e:
             messagebox.showerror("Error", f"Filter could not be applied:\n{e}")
             
-    def refresh_data(self):
+    def filter_builder(self):
+        if not self.current_table:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+            
+        table_name = self.current_table
+        affinities = {col[1]: column_affinity(col[2]) for col in self.table_info(table_name)}
+        columns = list(affinities)
+        
+        dialog = tk.Toplevel(self)
+        dialog.title(f"Filter Builder - {table_name}")
+        dialog.geometry("760x560")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        top = ttk.Frame(dialog)
+        top.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Label(top, text="Match:").pack(side=tk.LEFT)
+        match_combo = ttk.Combobox(top, state='readonly', width=18, values=('all conditions', 'any condition'))
+        match_combo.current(0)
+        match_combo.pack(side=tk.LEFT, padx=5)
+        
+        rows_frame = ttk.LabelFrame(dialog, text="Conditions", padding=10)
+        rows_frame.pack(fill=tk.X, padx=10, pady=10)
+        condition_rows = []
+        
+        def add_condition(column=None, op='=', value='', value2=''):
+            frame = ttk.Frame(rows_frame)
+            frame.pack(fill=tk.X, pady=2)
+            column_combo = ttk.Combobox(frame, state='readonly', width=20, values=columns)
+            column_combo.set(column or columns[0])
+            column_combo.pack(side=tk.LEFT, padx=2)
+            op_combo = ttk.Combobox(frame, state='readonly', width=11, values=FILTER_OPERATORS)
+            op_combo.set(op)
+            op_combo.pack(side=tk.LEFT, padx=2)
+            value_entry = tk.Entry(frame, width=24, bg="#2d2d2d", fg="white", insertbackground="white",
+                                   relief=tk.FLAT)
+            value_entry.insert(0, value)
+            value_entry.pack(side=tk.LEFT, padx=2, ipady=2)
+            ttk.Label(frame, text="and").pack(side=tk.LEFT, padx=2)
+            value2_entry = tk.Entry(frame, width=16, bg="#2d2d2d", fg="white", insertbackground="white",
+                                    relief=tk.FLAT)
+            value2_entry.insert(0, value2)
+            value2_entry.pack(side=tk.LEFT, padx=2, ipady=2)
+            row = (frame, column_combo, op_combo, value_entry, value2_entry)
+            
+            def remove():
+                frame.destroy()
+                condition_rows.remove(row)
+                
+            ttk.Button(frame, text="✖", width=3, command=remove).pack(side=tk.LEFT, padx=2)
+            condition_rows.append(row)
+            
+        saved = self.data_filter if self.data_filter and self.data_filter['table'] == table_name else None
+        if saved:
+            match_combo.current(0 if saved['match_all'] else 1)
+            for condition in saved['conditions']:
+                add_condition(*condition)
+        else:
+            add_condition()
+            
+        ttk.Button(dialog, text="➕ Add Condition", command=add_condition).pack(anchor=tk.W, padx=10)
+        
+        ttk.Label(dialog, text="Values are bound as parameters and typed by column affinity. "
+                               "'starts with' is case-sensitive; on TEXT columns it becomes an index-friendly range.",
+                  foreground="#888888", wraplength=720).pack(fill=tk.X, padx=10, pady=(5, 0))
+        
+        plan_frame = ttk.LabelFrame(dialog, text="SQL and Query Plan", padding=5)
+        plan_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        plan_text = tk.Text(plan_frame, height=8, bg="#2d2d2d", fg="white", font=("Consolas", 9),
+                            relief=tk.FLAT, wrap=tk.WORD)
+        plan_text.pack(fill=tk.BOTH, expand=True)
+        
+        def build():
+            conditions = [(column_combo.get(), op_combo.get(), value_entry.get(), value2_entry.get())
+                          for _, column_combo, op_combo, value_entry, value2_entry in condition_rows]
+            match_all = match_combo.current() == 0
+            where_clause, params = build_filter_clause(conditions, affinities, match_all)
+            return conditions, match_all, where_clause, params
+            
+        def check_plan():
+            plan_text.delete(1.0, tk.END)
+            try:
+                _, _, where_clause, params = build()
+                query = f"SELECT * FROM {table_name}" + (f" WHERE {where_clause}" if where_clause else "")
+                self.cursor.execute(f"EXPLAIN QUERY PLAN {query}", params)
+                details = [row[3] for row in self.cursor.fetchall()]
+            except Exception as e:
+                plan_text.insert(tk.END, f"Error: {e}")
+                return
+                
+            uses_index = any(' USING ' in detail and ('INDEX' in detail or 'PRIMARY KEY' in detail)
+                             for detail in details)
+            scans = any(detail.startswith('SCAN') and ' USING ' not in detail for detail in details)
+            if uses_index and not scans:
+                verdict = "✓ Uses an index"
+            elif uses_index:
+                verdict = "⚠ Uses an index for part of the filter; some parts scan the table"
+            else:
+                verdict = "⚠ Full table scan: no index matches these conditions"
+            plan_text.insert(tk.END, f"{query}\n\nParameters: {params}\n\n" + "\n".join(details) + f"\n\n{verdict}")
+            
+        def apply():
+            try:
+                conditions, match_all, where_clause, params = build()
+            except ValueError as e:
+                messagebox.showerror("Error", f"Filter could not be built:\n{e}", parent=dialog)
+                return
+            if not self.confirm_discard_pending():
+                return
+            self.data_filter = {'table': table_name, 'conditions': conditions, 'match_all': match_all}
+            dialog.destroy()
+            self.filter_entry.delete(0, tk.END)
+            self.load_table_data(table_name, where_clause, params, self.data_order)
+            
+        def clear():
+            if not self.confirm_discard_pending():
+                return
+            self.data_filter = None
+            dialog.destroy()
+            self.load_table_data(table_name, order_by=self.data_order)
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        ttk.Button(btn_frame, text="Check Plan", command=check_plan).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Apply", command=apply, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Clear Filter", command=clear).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def toggle_sample_mode(self):
+        if not self.confirm_discard_pending():
+            return
+            
+        self.data_sample = None
         if self.current_table:
-            self.load_table_data(self.current_table)
+            self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+            
+    def draw_sample(self, table_name):
+        try:
+            size = max(1, int(self.sample_size_spin.get()))
+        except ValueError:
+            size = 1000
+            self.sample_size_spin.set(size)
+            
+        rowids, total, error, method = sample_table_rowids(self.cursor, table_name, self.data_rowid, size)
+        self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS sample_rowids (id INTEGER PRIMARY KEY)")
+        self.cursor.execute("DELETE FROM temp.sample_rowids")
+        self.cursor.executemany("INSERT INTO temp.sample_rowids (id) VALUES (?)", [(r,) for r in rowids])
+        self.conn.commit()
+        self.data_sample = {'table': table_name, 'size': len(rowids), 'total': total,
+                            'error': error, 'method': method}
+        
+    def refresh_data(self):
+        if self.current_table and self.confirm_discard_pending():
+            self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+            
+    def fetch_data_window(self, table_name, conditions, params):
+        window = self.data_window
+        key = window['key']
+        
+        def fetch(op, order, limit):
+            where = ' AND '.join([*conditions, f"{key} {op} ?"])
+            self.cursor.execute(f"SELECT {key}, {self.data_select_list()} FROM {table_name} WHERE {where} "
+                                f"ORDER BY {key} {order} LIMIT {limit}", [*params, window['anchor']])
+            rows = self.cursor.fetchall()
+            return rows if order == 'ASC' else rows[::-1]
+            
+        window['anchor_index'] = None
+        if window['direction'] == 'around':
+            rows = fetch('<', 'DESC', DATA_WINDOW_SIZE // 2)
+            window['anchor_index'] = len(rows)
+            rows += fetch('>=', 'ASC', DATA_WINDOW_SIZE - len(rows))
+        elif window['direction'] == 'after':
+            rows = fetch('>', 'ASC', DATA_WINDOW_SIZE) or fetch('<=', 'DESC', DATA_WINDOW_SIZE)
+        else:
+            rows = fetch('<', 'DESC', DATA_WINDOW_SIZE) or fetch('>=', 'ASC', DATA_WINDOW_SIZE)
+            
+        window['first'] = rows[0][0] if rows else None
+        window['last'] = rows[-1][0] if rows else None
+        return [row[1:] for row in rows]
+        
+    def rowid_histogram(self):
+        histogram = self.rowid_histograms.get(self.current_table)
+        if histogram is None:
+            histogram = rowid_histogram(self.cursor, self.current_table, self.data_rowid)
+            self.rowid_histograms[self.current_table] = histogram
+        return histogram
+        
+    def go_to_row(self):
+        if not self.current_table:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+            
+        pk_columns = [col[1] for col in sorted(self.table_info(self.current_table), key=lambda col: col[5]) if col[5]]
+        modes = []
+        if self.data_rowid:
+            modes.append("Rowid")
+        if len(pk_columns) == 1:
+            modes.append(f"Primary key ({pk_columns[0]})")
+        if self.data_rowid:
+            modes.append("Row number (approximate)")
+        if not modes:
+            messagebox.showwarning("Warning", f"{self.current_table} has no rowid and no single-column primary key.")
+            return
+            
+        dialog = tk.Toplevel(self)
+        dialog.title("Go To Row")
+        dialog.geometry("420x150")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        form = ttk.Frame(dialog)
+        form.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(form, text="Go to:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        mode_combo = ttk.Combobox(form, state='readonly', width=30, values=modes)
+        mode_combo.current(0)
+        mode_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(form, text="Value:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        value_entry = tk.Entry(form, width=33, bg="#2d2d2d", fg="white", insertbackground="white", relief=tk.FLAT)
+        value_entry.grid(row=1, column=1, sticky=tk.W, padx=5, pady=3)
+        value_entry.focus_set()
+        
+        def go():
+            mode = mode_combo.get()
+            text = value_entry.get().strip()
+            if not text:
+                return
+            try:
+                if mode == "Rowid":
+                    key, label, anchor = self.data_rowid, 'rowid', int(text)
+                elif mode.startswith("Primary key"):
+                    key, label, anchor = quote_identifier(pk_columns[0]), pk_columns[0], coerce_parameter(text)
+                else:
+                    points, total = self.rowid_histogram()
+                    if not total:
+                        raise ValueError(f"{self.current_table} is empty")
+                    key, label = self.data_rowid, 'rowid'
+                    anchor = histogram_rowid(points, total, int(text.replace(',', '')))
+            except (ValueError, sqlite3.Error) as e:
+                messagebox.showerror("Error", f"Invalid position:\n{e}", parent=dialog)
+                return
+                
+            if not self.confirm_discard_pending():
+                return
+            dialog.destroy()
+            self.data_window = {'table': self.current_table, 'key': key, 'label': label,
+                                'anchor': anchor, 'direction': 'around'}
+            self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+            
+            children = self.data_tree.get_children()
+            index = self.data_window and self.data_window['anchor_index']
+            if index is not None and index < len(children):
+                self.data_tree.selection_set(children[index])
+                self.data_tree.see(children[index])
+                
+        value_entry.bind('<Return>', lambda e: go())
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        ttk.Button(btn_frame, text="Go", command=go, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def page_data_window(self, step):
+        window = self.data_window
+        if not window or window['first'] is None:
+            messagebox.showinfo("Info", "Use Go To to open a window of rows first.")
+            return
+            
+        if not self.confirm_discard_pending():
+            return
             
+        window['direction'] = 'after' if step > 0 else 'before'
+        window['anchor'] = window['last'] if step > 0 else window['first']
+        self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+        
+    def close_data_window(self):
+        if self.data_window and self.confirm_discard_pending():
+            self.data_window = None
+            self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+            
+    def database_versions(self):
+        versions = {}
+        for schema in ('main', *self.attached):
+            self.cursor.execute(f"PRAGMA {schema}.data_version")
+            data_version = self.cursor.fetchone()[0]
+            self.cursor.execute(f"PRAGMA {schema}.schema_version")
+            versions[schema] = (data_version, self.cursor.fetchone()[0])
+        return versions
+        
+    def watch_database(self):
+        self.after(WATCH_INTERVAL_MS, self.watch_database)
+        workspace = self.workspace
+        if not self.watch_var.get() or not self.conn or self.conn.in_transaction:
+            return
+            
+        files = file_signature(path for path in (self.db_path, *self.attached.values()) if path)
+        workspace.watch_ticks += 1
+        if files == workspace.watch_files and workspace.watch_ticks < WATCH_FULL_CHECK_TICKS:
+            return
+            
+        try:
+            versions = self.database_versions()
+        except sqlite3.Error:
+            return
+        workspace.watch_files = files
+        workspace.watch_ticks = 0
+        previous, workspace.watch_versions = workspace.watch_versions, versions
+        if previous is None:
+            return
+            
+        changed = {schema for schema in versions if schema in previous and versions[schema] != previous[schema]}
+        if not changed:
+            return
+            
+        schema_changed = any(versions[schema][1] != previous[schema][1] for schema in changed)
+        if schema_changed:
+            self.refresh_tables()
+            self.refresh_schema()
+            if self.current_table and self.current_table not in self.object_index.names:
+                self.set_status(f"Table dropped by another connection: {self.current_table}")
+                self.current_table = None
+                self.data_sample = None
+                self.pending_changes.clear()
+                self.clear_tree(self.data_tree)
+                self.row_count_label.config(text="No data")
+                return
+                
+        if not self.current_table or self.split_table_name(self.current_table)[0] not in changed:
+            if schema_changed:
+                self.set_status("Schema changed by another connection")
+        elif self.pending_changes:
+            schema = self.split_table_name(self.current_table)[0]
+            workspace.watch_versions[schema] = (previous[schema][0], versions[schema][1])
+            workspace.watch_files = None
+            self.set_status(f"{self.current_table} changed on disk; save or discard your edits to reload")
+        else:
+            selection = self.data_tree.selection()
+            position = self.data_tree.yview()[0]
+            self.rowid_histograms.pop(self.current_table, None)
+            self.load_table_data(self.current_table, self.data_where, self.data_params, self.data_order)
+            kept = [iid for iid in selection if self.data_tree.exists(iid)]
+            if kept:
+                self.data_tree.selection_set(kept)
+            self.data_tree.yview_moveto(position)
+            self.set_status(f"{self.current_table} reloaded after an external change")
+            
+    def rowid_alias(self, table_name):
+        schema, name = self.split_table_name(table_name)
+        self.cursor.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE type='table' AND name = ?", (name,))
+        if not self.cursor.fetchone():
+            return None
+            
+        names = {col[1].lower() for col in self.table_info(table_name)}
+        
+        for alias in ('rowid', '_rowid_', 'oid'):
+            if alias in names:
+                continue
+            try:
+                self.cursor.execute(f"SELECT {alias} FROM {table_name} LIMIT 0")
+                return alias
+            except sqlite3.OperationalError:
+                return None
+        return None
+        
+    def data_select_list(self):
+        parts = [self.data_rowid] if self.data_rowid else []
+        for col in map(quote_identifier, self.data_columns):
+            parts.append(f"CASE WHEN length({col}) > {CELL_PREVIEW_LIMIT} "
+                         f"THEN substr({col}, 1, {CELL_PREVIEW_LIMIT}) ELSE {col} END")
+            parts.append(f"CASE WHEN length({col}) > {CELL_PREVIEW_LIMIT} THEN length({col}) END")
+        return ", ".join(parts)
+        
+    def split_data_row(self, row):
+        iid = str(row[0]) if self.data_rowid else None
+        cells = row[1:] if self.data_rowid else row
+        values = []
+        truncated = {}
+        for col, value, length in zip(self.data_columns, cells[::2], cells[1::2]):
+            if length is not None:
+                truncated[col] = length
+                value = format_cell_preview(value, length)
+            values.append(value)
+        return iid, values, truncated
+        
+    def track_truncated(self, item, truncated):
+        if truncated:
+            self.data_truncated[item] = truncated
+        else:
+            self.data_truncated.pop(item, None)
+            
+    def insert_data_row(self, row, index=tk.END):
+        iid, values, truncated = self.split_data_row(row)
+        item = self.data_tree.insert('', index, iid=iid, values=values)
+        self.data_values[item] = values
+        self.track_truncated(item, truncated)
+        return item
+        
+    def row_key(self, item, columns, values):
+        if self.data_rowid:
+            return f"{self.data_rowid} = ?", [int(item)]
+        return self.row_where_clause(columns, values)
+        
+    def patch_data_row(self, item, where_clause, params):
+        query = f"SELECT {self.data_select_list()} FROM {self.current_table} WHERE {where_clause}"
+        params = list(params)
+        if self.data_where:
+            query += f" AND ({self.data_where})"
+            params.extend(self.data_params)
+            
+        self.cursor.execute(query + " LIMIT 1", params)
+        row = self.cursor.fetchone()
+        
+        exists = item and self.data_tree.exists(item)
+        if row is None:
+            if exists:
+                self.data_tree.delete(item)
+                self.data_truncated.pop(item, None)
+                self.data_values.pop(item, None)
+        elif exists and (not self.data_rowid or str(row[0]) == item):
+            _, values, truncated = self.split_data_row(row)
+            self.data_tree.item(item, values=values)
+            self.data_values[item] = values
+            self.track_truncated(item, truncated)
+        else:
+            index = tk.END
+            if exists:
+                index = self.data_tree.index(item)
+                self.data_tree.delete(item)
+                self.data_truncated.pop(item, None)
+                self.data_values.pop(item, None)
+            item = self.insert_data_row(row, index)
+            self.data_tree.selection_set(item)
+            self.data_tree.see(item)
+            
+        self.update_row_count_label()
+        
+    def update_row_count_label(self):
+        shown = len(self.data_tree.get_children())
+        text = f"Rows: {shown} | Columns: {len(self.data_tree['columns'])}"
+        if self.data_sample:
+            text = self.sample_summary(shown) + f" | Columns: {len(self.data_tree['columns'])}"
+        elif self.data_window:
+            text = self.window_summary(shown) + f" | Columns: {len(self.data_tree['columns'])}"
+        selected = len(self.data_tree.selection())
+        if selected > 1:
+            text += f" | Selected: {selected}"
+        if self.pending_changes:
+            text += f" | Pending changes: {len(self.pending_changes)}"
+        self.row_count_label.config(text=text)
+        
+    def window_summary(self, shown):
+        window = self.data_window
+        if window['first'] is None:
+            return f"Window by {window['label']}: no rows"
+        text = f"Window: {shown:,} rows, {window['label']} {window['first']} … {window['last']}"
+        histogram = self.rowid_histograms.get(self.current_table)
+        if histogram and histogram[1] and window['key'] == self.data_rowid:
+            points, total = histogram
+            first = histogram_row_number(points, total, window['first'])
+            last = histogram_row_number(points, total, window['last'])
+            exact = "" if len(points) == total else "≈ "
+            text += f" | {exact}rows {first:,}–{last:,} of {'' if not exact else '~'}{total:,}"
+        return text
+        
+    def sample_summary(self, shown):
+        sample = self.data_sample
+        n, total = sample['size'], sample['total']
+        text = f"Sample: {n:,} of ~{total:,} rows"
+        if sample['error']:
+            text += f" (±{sample['error']:,})"
+        fpc = math.sqrt((total - n) / (total - 1)) if total > 1 and total >= n else 0
+        
+        if shown != n and n:
+            share = shown / n
+            margin = 1.96 * math.sqrt(share * (1 - share) / n) * fpc
+            text += f" | Shown: {shown:,} (~{share * total:,.0f} ±{margin * total:,.0f} in table)"
+        elif n:
+            text += f" | ±{1.96 * math.sqrt(0.25 / n) * fpc:.1%} (95% CI)"
+        if sample['method'] == 'seek':
+            text += " | sparse rowids: seek-sampled, biased toward rows after gaps"
+        return text
+        
+    def row_where_clause(self, columns, values):
+        row = dict(zip(self.data_tree['columns'], values))
+        key_cols = [col[1] for col in columns if col[5]] or [col[1] for col in columns]
+        where_parts = [f"{quote_identifier(col_name)} = ?" for col_name in key_cols]
+        params = [row[col_name] for col_name in key_cols]
+        return " AND ".join(where_parts), params
+        
+    def start_inline_edit(self, event):
+        if not self.current_table:
+            return
+            
+        item = self.data_tree.identify_row(event.y)
+        column = self.data_tree.identify_column(event.x)
+        if not item or not column or column == '#0':
+            return
+            
+        bbox = self.data_tree.bbox(item, column)
+        if not bbox:
+            return
+            
+        col_index = int(column[1:]) - 1
+        col_name = self.data_tree['columns'][col_index]
+        if col_name in self.data_truncated.get(item, {}):
+            self.show_cell_viewer(item, col_name)
+            return
+        if col_name not in {col[1] for col in self.table_info(self.current_table)}:
+            self.set_status(f"{col_name} is a generated column and cannot be edited")
+            return
+        changes = self.pending_changes.get(item, {}).get('changes', {})
+        current = changes[col_name] if col_name in changes else self.data_values[item][col_index]
+        old_value = "" if current is None else str(current)
+        
+        x, y, width, height = bbox
+        entry = tk.Entry(self.data_tree, bg="#2d2d2d", fg="white", insertbackground="white",
+                         relief=tk.FLAT, font=("Consolas", 9))
+        entry.place(x=x, y=y, width=max(width - 40, 20), height=height)
+        entry.insert(0, old_value)
+        entry.select_range(0, tk.END)
+        entry.focus_set()
+        null_button = ttk.Button(self.data_tree, text="NULL", takefocus=False)
+        null_button.place(x=x + max(width - 40, 20), y=y, width=40, height=height)
+        
+        def close():
+            entry.destroy()
+            null_button.destroy()
+            
+        def save(event=None, explicit=False):
+            if not entry.winfo_exists():
+                return
+            new_value = entry.get()
+            close()
+            # An empty entry on a NULL cell only becomes '' when confirmed with Return
+            if new_value != old_value or (explicit and current is None):
+                self.stage_cell_change(item, col_name, new_value)
+                
+        def set_null():
+            close()
+            if current is not None:
+                self.stage_cell_change(item, col_name, None)
+                
+        null_button.config(command=set_null)
+        entry.bind('<Return>', lambda e: save(explicit=True))
+        entry.bind('<FocusOut>', save)
+        entry.bind('<Escape>', lambda e: close())
+        
+    def stage_cell_change(self, item, col_name, value):
+        original = self.data_values[item]
+        col_index = list(self.data_tree['columns']).index(col_name)
+        
+        if item not in self.pending_changes:
+            self.pending_changes[item] = {'original': original, 'changes': {}}
+        changes = self.pending_changes[item]['changes']
+        changes[col_name] = value
+        
+        values = [changes.get(col, original[i]) for i, col in enumerate(self.data_tree['columns'])]
+        self.data_tree.item(item, values=values, tags=('pending',))
+        self.update_row_count_label()
+        self.set_status(f"{len(self.pending_changes)} row(s) with pending changes - click Commit to save")
+        
+    def commit_pending_changes(self):
+        if not self.current_table or not self.pending_changes:
+            self.set_status("No pending changes")
+            return
+            
+        try:
+            columns = self.table_info(self.current_table)
+            
+            batches = {}
+            for item, pending in self.pending_changes.items():
+                where_clause, key_params = self.row_key(item, columns, pending['original'])
+                set_cols = list(pending['changes'])
+                query = f"UPDATE {self.current_table} SET {', '.join(f'{c} = ?' for c in set_cols)} WHERE {where_clause}"
+                batches.setdefault(query, []).append([pending['changes'][c] for c in set_cols] + key_params)
+                
+            for query, params in batches.items():
+                self.cursor.executemany(query, params)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            messagebox.showerror("Error", f"Changes could not be committed:\n{e}")
+            return
+            
+        count = len(self.pending_changes)
+        pk_cols = {col[1] for col in columns if col[5]}
+        generated = len(columns) < len(self.data_tree['columns'])
+        pending_changes = list(self.pending_changes.items())
+        self.pending_changes.clear()
+        for item, pending in pending_changes:
+            if not self.data_tree.exists(item):
+                continue
+            self.data_tree.item(item, tags=())
+            values = [pending['changes'].get(col, pending['original'][i]) for i, col in enumerate(self.data_tree['columns'])]
+            self.data_values[item] = values
+            if self.data_rowid and pk_cols.intersection(pending['changes']):
+                self.patch_data_row(item, *self.row_where_clause(columns, values))
+            elif generated:
+                self.patch_data_row(item, *self.row_key(item, columns, values))
+        self.update_row_count_label()
+        self.set_status(f"{count} row(s) updated in {self.current_table}")
+        
+    def revert_pending_changes(self):
+        if not self.pending_changes:
+            self.set_status("No pending changes")
+            return
+            
+        for item, pending in self.pending_changes.items():
+            if self.data_tree.exists(item):
+                self.data_tree.item(item, values=pending['original'], tags=())
+        self.pending_changes.clear()
+        self.update_row_count_label()
+        self.set_status("Pending changes discarded")
+        
+    def confirm_discard_pending(self):
+        if not self.pending_changes:
+            return True
+            
+        if not messagebox.askyesno("Pending Changes",
+                                   f"{len(self.pending_changes)} row(s) have uncommitted changes.\nDiscard them?"):
+            return False
+            
+        self.revert_pending_changes()
+        return True
+        
  
     def add_row(self):
         if not self.current_table:
@@ -519,8 +3226,7 @@ class SQLiteManager(tk.Tk):
             return
             
         try:
-            self.cursor.execute(f"PRAGMA table_info({self.current_table})")
-            columns = self.cursor.fetchall()
+            columns = self.table_info(self.current_table)
             
             dialog = tk.Toplevel(self)
             dialog.title("Add New Row")
@@ -584,10 +3290,24 @@ class SQLiteManager(tk.Tk):
                         
                     placeholders = ','.join(['?' for _ in values])
                     col_str = ','.join(cols)
+                    query = f"INSERT INTO {self.current_table} ({col_str}) VALUES ({placeholders})"
                     
-                    self.cursor.execute(f"INSERT INTO {self.current_table} ({col_str}) VALUES ({placeholders})", values)
+                    if self.data_rowid:
+                        self.cursor.execute(query, values)
+                        key = (f"{self.data_rowid} = ?", [self.cursor.lastrowid])
+                    elif SUPPORTS_RETURNING:
+                        returning = ", ".join(quote_identifier(col) for col in self.data_tree['columns'])
+                        self.cursor.execute(f"{query} RETURNING {returning}", values)
+                        key = self.row_where_clause(columns, self.cursor.fetchone())
+                    else:
+                        self.cursor.execute(query, values)
+                        key = None
                     self.conn.commit()
-                    self.refresh_data()
+                    
+                    if key:
+                        self.patch_data_row(None, *key)
+                    else:
+                        self.refresh_data()
                     dialog.destroy()
                     self.set_status(f"Row added to {self.current_table}")
                 except Exception as e:
@@ -613,11 +3333,12 @@ class SQLiteManager(tk.Tk):
             return
             
         try:
-            item = self.data_tree.item(selected[0])
-            values = item['values']
+            names = list(self.data_tree['columns'])
+            key_values = self.data_values[selected[0]]
+            original = dict(zip(names, key_values))
+            values = dict(original, **self.pending_changes.get(selected[0], {}).get('changes', {}))
             
-            self.cursor.execute(f"PRAGMA table_info({self.current_table})")
-            columns = self.cursor.fetchall()
+            columns = self.table_info(self.current_table)
             
             dialog = tk.Toplevel(self)
             dialog.title("Edit Row")
@@ -635,9 +3356,9 @@ class SQLiteManager(tk.Tk):
             canvas.configure(yscrollcommand=scrollbar.set)
             
             entries = {}
-            pk_info = []
+            truncated = self.data_truncated.get(selected[0], {})
             
-            for i, col in enumerate(columns):
+            for col in columns:
                 col_name = col[1]
                 pk = col[5]
                 
@@ -647,55 +3368,222 @@ class SQLiteManager(tk.Tk):
                 label_text = col_name
                 if pk:
                     label_text += " (PK)"
-                    pk_info.append((col_name, values[i]))
                     
                 ttk.Label(frame, text=label_text, width=20).pack(side=tk.LEFT)
                 
                 entry = tk.Entry(frame, bg="#2d2d2d", fg="white", insertbackground="white")
-                if i < len(values):
-                    entry.insert(0, str(values[i]))
+                if col_name in values:
+                    entry.insert(0, str(values[col_name]))
+                if col_name in truncated:
+                    entry.config(state='readonly', readonlybackground="#252525")
                 entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(10, 0))
                 entries[col_name] = entry
                 
-            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            
+            def update():
+                try:
+                    changed = {}
+                    for col_name, entry in entries.items():
+                        if col_name not in original or entry.get() != str(original[col_name]):
+                            changed[col_name] = entry.get()
+                            
+                    if not changed:
+                        dialog.destroy()
+                        return
+                        
+                    set_parts = [f"{col_name} = ?" for col_name in changed]
+                    params = list(changed.values())
+                    
+                    where_clause, key_params = self.row_key(selected[0], columns, key_values)
+                    params.extend(key_params)
+                        
+                    query = f"UPDATE {self.current_table} SET {', '.join(set_parts)} WHERE {where_clause}"
+                    self.cursor.execute(query, params)
+                    self.conn.commit()
+                    self.pending_changes.pop(selected[0], None)
+                    
+                    if self.data_rowid and not any(col[5] and col[1] in changed for col in columns):
+                        self.patch_data_row(selected[0], where_clause, key_params)
+                    else:
+                        new_values = [changed.get(name, key_values[i]) for i, name in enumerate(names)]
+                        self.patch_data_row(selected[0], *self.row_where_clause(columns, new_values))
+                    dialog.destroy()
+                    self.set_status(f"Row updated in {self.current_table}")
+                except Exception as e:
+                    messagebox.showerror("Error", f"Row could not be updated:\n{e}")
+                    
+            btn_frame = ttk.Frame(dialog)
+            btn_frame.pack(fill=tk.X, padx=10, pady=10)
+            
+            ttk.Button(btn_frame, text="Update", command=update, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+            ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+            
+        except Exception as e:
+            messagebox.showerror("Error", f"Edit failed:\n{e}")
+            
+    def show_cell_viewer(self, item=None, col_name=None):
+        if not self.current_table:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+            
+        item = item or (self.data_tree.selection() or (None,))[0]
+        if not item:
+            messagebox.showwarning("Warning", "Please select a row.")
+            return
+            
+        columns = self.table_info(self.current_table)
+        values = self.data_values[item]
+        key_clause, key_params = self.row_key(item, columns, values)
+        schema, table = self.split_table_name(self.current_table)
+        rowid = int(item) if self.data_rowid else None
+        col_names = list(self.data_tree['columns'])
+        col_name = col_name or next(iter(self.data_truncated.get(item, {})), col_names[0])
+        
+        dialog = tk.Toplevel(self)
+        dialog.title(f"Cell Viewer: {self.current_table}")
+        dialog.geometry("800x600")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        top = ttk.Frame(dialog)
+        top.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(top, text="Column:").pack(side=tk.LEFT)
+        column_combo = ttk.Combobox(top, state='readonly', values=col_names, width=20)
+        column_combo.pack(side=tk.LEFT, padx=5)
+        column_combo.set(col_name)
+        
+        mode_var = tk.StringVar(value='text')
+        for mode, label in (('text', 'Text'), ('hex', 'Hex'), ('image', 'Image')):
+            ttk.Radiobutton(top, text=label, value=mode, variable=mode_var,
+                            command=lambda: render()).pack(side=tk.LEFT, padx=5)
+                            
+        info_label = ttk.Label(dialog, text="")
+        info_label.pack(fill=tk.X, padx=10)
+        
+        content = ttk.Frame(dialog)
+        content.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        text_scroll = ttk.Scrollbar(content)
+        text = tk.Text(content, wrap=tk.NONE, bg="#1e1e1e", fg="#d4d4d4", insertbackground="white",
+                       relief=tk.FLAT, font=("Consolas", 10), yscrollcommand=text_scroll.set)
+        text_scroll.config(command=text.yview)
+        image_label = ttk.Label(content, anchor=tk.CENTER)
+        
+        state = {'cell': None, 'type': None, 'size': 0, 'data': b''}
+        
+        def load_cell(event=None):
+            state['cell'] = CellRef(schema, table, column_combo.get(), key_clause, key_params, rowid)
+            try:
+                info = state['cell'].info(self.conn)
+                if info is None:
+                    raise ValueError("The row no longer exists.")
+                state['type'], state['size'] = info[0], info[1] or 0
+                state['data'] = state['cell'].read(self.conn, 0, CELL_PAGE_SIZE)
+            except Exception as e:
+                messagebox.showerror("Error", f"Cell could not be read:\n{e}", parent=dialog)
+                state['type'], state['size'], state['data'] = None, 0, b''
+            is_image = state['data'][:8] == b'\x89PNG\r\n\x1a\n' or state['data'][:4] == b'GIF8'
+            if state['type'] == 'blob' and is_image:
+                mode_var.set('image')
+            elif state['type'] == 'blob':
+                mode_var.set('hex')
+            else:
+                mode_var.set('text')
+            render()
+            
+        def load_more():
+            if state['cell'] is None or len(state['data']) >= state['size']:
+                return
+            try:
+                state['data'] += state['cell'].read(self.conn, len(state['data']), CELL_PAGE_SIZE)
+            except Exception as e:
+                messagebox.showerror("Error", f"Cell could not be read:\n{e}", parent=dialog)
+            render()
+            
+        def render():
+            mode = mode_var.get()
+            shown = state['size']
+            text.pack_forget()
+            text_scroll.pack_forget()
+            image_label.pack_forget()
+            
+            if mode == 'image':
+                image_label.pack(fill=tk.BOTH, expand=True)
+                if state['size'] > IMAGE_PREVIEW_LIMIT:
+                    image_label.config(image='', text=f"Image preview is limited to {format_size(IMAGE_PREVIEW_LIMIT)}")
+                else:
+                    try:
+                        if len(state['data']) < state['size']:
+                            state['data'] += state['cell'].read(self.conn, len(state['data']),
+                                                                state['size'] - len(state['data']))
+                        photo = tk.PhotoImage(master=dialog, data=base64.b64encode(state['data']))
+                        image_label.config(image=photo, text='')
+                        image_label.image = photo
+                        shown = f"{photo.width()}x{photo.height()}"
+                    except Exception as e:
+                        image_label.config(image='', text=f"Image could not be displayed:\n{e}")
+            else:
+                text_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+                text.pack(fill=tk.BOTH, expand=True)
+                text.delete('1.0', tk.END)
+                if mode == 'hex':
+                    text.insert('1.0', hex_dump(state['data']))
+                else:
+                    text.insert('1.0', state['data'].decode('utf-8', errors='replace'))
+                    
+            loaded = min(len(state['data']), state['size'])
+            info_label.config(text=f"Type: {state['type']} | Size: {format_size(state['size'])} | "
+                                   f"Loaded: {format_size(loaded)}" + (f" | {shown}" if mode == 'image' else ""))
+                                   
+        def save_as():
+            if state['cell'] is None:
+                return
+            file_path = filedialog.asksaveasfilename(parent=dialog, title="Save Cell Value",
+                                                     defaultextension=".bin",
+                                                     filetypes=[("All Files", "*.*")])
+            if not file_path:
+                return
+                
+            cell = state['cell']
+            total = state['size']
+            connect = self.worker_connector()
             
-            def update():
+            def work(task):
+                conn = connect()
+                written = 0
                 try:
-                    set_parts = []
-                    params = []
-                    
-                    for col_name, entry in entries.items():
-                        set_parts.append(f"{col_name} = ?")
-                        params.append(entry.get())
-                        
-                    where_parts = []
-                    for pk_col, pk_val in pk_info:
-                        where_parts.append(f"{pk_col} = ?")
-                        params.append(pk_val)
-                        
-                    if not where_parts:
-                        where_parts = [f"{col[1]} = ?" for col in columns]
-                        params.extend(values)
-                        
-                    query = f"UPDATE {self.current_table} SET {', '.join(set_parts)} WHERE {' AND '.join(where_parts)}"
-                    self.cursor.execute(query, params)
-                    self.conn.commit()
-                    self.refresh_data()
-                    dialog.destroy()
-                    self.set_status(f"Row updated in {self.current_table}")
-                except Exception as e:
-                    messagebox.showerror("Error", f"Row could not be updated:\n{e}")
-                    
-            btn_frame = ttk.Frame(dialog)
-            btn_frame.pack(fill=tk.X, padx=10, pady=10)
-            
-            ttk.Button(btn_frame, text="Update", command=update, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Edit failed:\n{e}")
-            
+                    with open(file_path, 'wb') as f:
+                        for chunk in cell.iter_chunks(conn):
+                            f.write(chunk)
+                            written += len(chunk)
+                            task.check_cancelled()
+                            task.report(f"{format_size(written)} of {format_size(total)} written",
+                                        written / total if total else None)
+                except BaseException:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                    raise
+                finally:
+                    conn.close()
+                return written
+                
+            self.run_background("Saving Cell", work,
+                                lambda written: self.set_status(f"{format_size(written)} saved to {file_path}"))
+                                
+        column_combo.bind('<<ComboboxSelected>>', load_cell)
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Button(btn_frame, text="Load More", command=load_more).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Save As...", command=save_as, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
+        
+        load_cell()
+        
     def delete_row(self):
         if not self.current_table:
             messagebox.showwarning("Warning", "Please select a table first.")
@@ -706,39 +3594,200 @@ class SQLiteManager(tk.Tk):
             messagebox.showwarning("Warning", "Please select a row to delete.")
             return
             
+        if len(selected) > 1:
+            self.bulk_delete_rows()
+            return
+            
         if not messagebox.askyesno("Confirmation", "Do you really want to delete the selected row?"):
             return
             
         try:
-            item = self.data_tree.item(selected[0])
-            values = item['values']
+            values = self.data_values[selected[0]]
             
-            self.cursor.execute(f"PRAGMA table_info({self.current_table})")
-            columns = self.cursor.fetchall()
+            columns = self.table_info(self.current_table)
             
-    
-            pk_cols = [col[1] for col in columns if col[5]]
-            
-            if pk_cols:
-                where_parts = []
-                params = []
-                for pk_col in pk_cols:
-                    idx = [col[1] for col in columns].index(pk_col)
-                    where_parts.append(f"{pk_col} = ?")
-                    params.append(values[idx])
-                where_clause = " AND ".join(where_parts)
-            else:
-                where_parts = [f"{col[1]} = ?" for col in columns]
-                where_clause = " AND ".join(where_parts)
-                params = list(values)
+            where_clause, params = self.row_key(selected[0], columns, values)
                 
             self.cursor.execute(f"DELETE FROM {self.current_table} WHERE {where_clause}", params)
             self.conn.commit()
-            self.refresh_data()
+            self.pending_changes.pop(selected[0], None)
+            self.data_tree.delete(selected[0])
+            self.data_values.pop(selected[0], None)
+            self.update_row_count_label()
             self.set_status(f"Row deleted from {self.current_table}")
         except Exception as e:
             messagebox.showerror("Error", f"Row could not be deleted:\n{e}")
             
+    def select_all_rows(self):
+        if not self.current_table:
+            return
+            
+        self.data_tree.selection_set(self.data_tree.get_children())
+        self.select_all_matching = not self.data_sample and not self.data_window
+        self.update_row_count_label()
+        return "break"
+        
+    def bulk_delete_rows(self):
+        items = self.data_tree.selection()
+        if not items or not self.confirm_discard_pending():
+            return
+            
+        if not messagebox.askyesno("Confirmation", f"Do you really want to delete the {len(items)} selected rows?"):
+            return
+            
+        table_name = self.current_table
+        workspace = self.workspace
+        
+        def done(affected):
+            if self.workspace is workspace and self.current_table == table_name:
+                self.data_tree.delete(*[item for item in items if self.data_tree.exists(item)])
+                self.update_row_count_label()
+            self.set_status(f"{affected} rows deleted from {table_name}")
+            
+        self.run_bulk_rows("Deleting", f"DELETE FROM {table_name}", [], done)
+        
+    def bulk_set_value(self):
+        if not self.current_table:
+            messagebox.showwarning("Warning", "Please select a table first.")
+            return
+            
+        items = self.data_tree.selection()
+        if not items:
+            messagebox.showwarning("Warning", "Please select the rows to update.")
+            return
+            
+        if not self.confirm_discard_pending():
+            return
+            
+        dialog = tk.Toplevel(self)
+        dialog.title("Set Column Value")
+        dialog.geometry("400x200")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        dialog.grab_set()
+        
+        form = ttk.Frame(dialog)
+        form.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        ttk.Label(form, text=f"Update {len(items)} selected rows").grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 10))
+        
+        ttk.Label(form, text="Column:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        column_combo = ttk.Combobox(form, state='readonly', values=list(self.data_tree['columns']))
+        column_combo.grid(row=1, column=1, sticky=tk.EW, pady=3)
+        if self.data_tree['columns']:
+            column_combo.current(0)
+            
+        ttk.Label(form, text="Value:").grid(row=2, column=0, sticky=tk.W, pady=3)
+        value_entry = tk.Entry(form, bg="#2d2d2d", fg="white", insertbackground="white")
+        value_entry.grid(row=2, column=1, sticky=tk.EW, pady=3)
+        
+        null_var = tk.BooleanVar()
+        ttk.Checkbutton(form, text="Set to NULL", variable=null_var).grid(row=3, column=1, sticky=tk.W, pady=3)
+        form.columnconfigure(1, weight=1)
+        
+        def apply():
+            col_name = column_combo.get()
+            if not col_name:
+                return
+            value = None if null_var.get() else value_entry.get()
+            table_name = self.current_table
+            workspace = self.workspace
+            dialog.destroy()
+            
+            def done(affected):
+                if self.workspace is workspace and self.current_table == table_name:
+                    col_index = list(self.data_tree['columns']).index(col_name)
+                    for item in items:
+                        if self.data_tree.exists(item):
+                            self.data_tree.set(item, col_name, str(value))
+                            self.data_values[item][col_index] = value
+                self.set_status(f"{affected} rows updated in {table_name}")
+                
+            self.run_bulk_rows("Updating", f"UPDATE {table_name} SET {col_name} = ?", [value], done)
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Button(btn_frame, text="Apply", command=apply, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def run_bulk_rows(self, verb, action, action_params, on_done):
+        items = self.data_tree.selection()
+        table_name = self.current_table
+        rowid = self.data_rowid
+        matching = self.select_all_matching and len(items) == len(self.data_tree.get_children())
+        where_clause, where_params = self.data_where, self.data_params
+        connect = self.worker_connector()
+        
+        if rowid:
+            rowids = [int(item) for item in items]
+        else:
+            columns = self.table_info(table_name)
+            row_keys = [self.row_where_clause(columns, self.data_values[item]) for item in items]
+            
+        def work(task):
+            conn = connect()
+            cursor = conn.cursor()
+            affected = 0
+            try:
+                if not rowid:
+                    total = len(row_keys)
+                    for done, (key_clause, key_params) in enumerate(row_keys, 1):
+                        cursor.execute(f"{action} WHERE {key_clause}", list(action_params) + key_params)
+                        affected += cursor.rowcount
+                        if done % BULK_CHUNK_SIZE == 0 or done == total:
+                            task.check_cancelled()
+                            task.report(f"{verb} rows: {done:,} of {total:,}", done / total)
+                            
+                elif matching or len(rowids) > BULK_TEMP_TABLE_THRESHOLD:
+                    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_rowids (id INTEGER PRIMARY KEY)")
+                    cursor.execute("DELETE FROM temp.bulk_rowids")
+                    if matching:
+                        query = f"INSERT INTO temp.bulk_rowids SELECT {rowid} FROM {table_name}"
+                        if where_clause:
+                            query += f" WHERE {where_clause}"
+                        cursor.execute(query, where_params)
+                    else:
+                        cursor.executemany("INSERT INTO temp.bulk_rowids VALUES (?)", ((r,) for r in rowids))
+                        
+                    cursor.execute("SELECT COUNT(*), MIN(id) FROM temp.bulk_rowids")
+                    total, low = cursor.fetchone()
+                    done = 0
+                    op = ">="
+                    while done < total:
+                        task.check_cancelled()
+                        cursor.execute(f"SELECT MAX(id), COUNT(*) FROM (SELECT id FROM temp.bulk_rowids "
+                                       f"WHERE id {op} ? ORDER BY id LIMIT ?)", (low, BULK_CHUNK_SIZE))
+                        high, count = cursor.fetchone()
+                        cursor.execute(f"{action} WHERE {rowid} IN (SELECT id FROM temp.bulk_rowids "
+                                       f"WHERE id {op} ? AND id <= ?)", list(action_params) + [low, high])
+                        affected += cursor.rowcount
+                        done += count
+                        low, op = high, ">"
+                        task.report(f"{verb} rows: {done:,} of {total:,}", done / total)
+                    cursor.execute("DROP TABLE temp.bulk_rowids")
+                    
+                else:
+                    total = len(rowids)
+                    for start in range(0, total, BULK_CHUNK_SIZE):
+                        task.check_cancelled()
+                        chunk = rowids[start:start + BULK_CHUNK_SIZE]
+                        placeholders = ','.join('?' for _ in chunk)
+                        cursor.execute(f"{action} WHERE {rowid} IN ({placeholders})", list(action_params) + chunk)
+                        affected += cursor.rowcount
+                        done = start + len(chunk)
+                        task.report(f"{verb} rows: {done:,} of {total:,}", done / total)
+                        
+                conn.commit()
+                return affected
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+                
+        self.run_background(f"{verb} rows in {table_name}", work, on_done)
+        
 
     def create_table_dialog(self):
         if not self.conn:
@@ -958,8 +4007,7 @@ class SQLiteManager(tk.Tk):
         table_name = self.table_listbox.get(selection[0])
         
         try:
-            self.cursor.execute(f"PRAGMA table_info({table_name})")
-            info = self.cursor.fetchall()
+            info = self.table_info(table_name)
             
             self.cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
             row_count = self.cursor.fetchone()[0]
@@ -1008,7 +4056,101 @@ class SQLiteManager(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error", f"Table info could not be loaded:\n{e}")
             
-
+    def profile_columns(self):
+        selection = self.table_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("Warning", "Please select a table.")
+            return
+            
+        table_name = self.table_listbox.get(selection[0])
+        connect = self.worker_connector()
+        
+        def work(task):
+            conn = connect()
+            try:
+                return profile_table(conn, table_name, task)
+            finally:
+                conn.close()
+                
+        self.run_background(f"Profiling {table_name}", work,
+                            lambda result: self.show_column_profile(table_name, *result))
+        
+    def show_column_profile(self, table_name, row_count, profiles):
+        dialog = tk.Toplevel(self)
+        dialog.title(f"Column Profile: {table_name}")
+        dialog.geometry("1000x600")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        ttk.Label(dialog, text=f"{table_name}: {row_count:,} rows, {len(profiles)} columns",
+                 font=("Segoe UI", 11, "bold")).pack(anchor=tk.W, padx=10, pady=10)
+                 
+        tree_frame = ttk.Frame(dialog)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        columns = ('Non-null', 'Nulls', 'Distinct ≈', 'Min', 'Max', 'Mean', 'Types', 'Top values ≈')
+        tree = ttk.Treeview(tree_frame, columns=columns, height=10)
+        tree.pack(fill=tk.BOTH, expand=True)
+        
+        tree.column('#0', width=140)
+        tree.heading('#0', text='Column')
+        for col in columns:
+            tree.column(col, width=260 if col == 'Top values ≈' else 90)
+            tree.heading(col, text=col)
+            
+        def short(value):
+            text = str(value) if value is not None else ''
+            return text if len(text) <= 40 else text[:40] + '…'
+            
+        for profile in profiles:
+            mean = profile.mean()
+            top = ', '.join(f"{short(value)} ({count:,})" for value, count in profile.top.most_common(5))
+            types = ', '.join(f"{name}: {count:,}" for name, count in profile.types.most_common())
+            tree.insert('', tk.END, text=profile.name, values=(
+                f"{profile.count - profile.nulls:,}", f"{profile.nulls:,}", f"{profile.distinct.estimate():,}",
+                short(profile.minimum), short(profile.maximum), f"{mean:.6g}" if mean is not None else '',
+                types, top))
+                
+        canvas = tk.Canvas(dialog, bg="#2d2d2d", highlightthickness=0, height=180)
+        canvas.pack(fill=tk.X, padx=10, pady=10)
+        
+        def draw_histogram(event=None):
+            canvas.delete('all')
+            selection = tree.selection()
+            if not selection:
+                canvas.create_text(10, 10, anchor=tk.NW, fill="#888888",
+                                   text="Select a column to show its histogram")
+                return
+                
+            profile = profiles[tree.index(selection[0])]
+            bins = profile.histogram()
+            if not bins:
+                canvas.create_text(10, 10, anchor=tk.NW, fill="#888888",
+                                   text=f"{profile.name}: no numeric values")
+                return
+                
+            width = max(canvas.winfo_width(), 200)
+            height = max(canvas.winfo_height(), 180)
+            peak = max(count for _, _, count in bins) or 1
+            bar_width = (width - 20) / len(bins)
+            for i, (low, high, count) in enumerate(bins):
+                x0 = 10 + i * bar_width
+                bar_height = (height - 50) * count / peak
+                canvas.create_rectangle(x0, height - 25 - bar_height, x0 + bar_width - 2, height - 25,
+                                        fill="#0078d4", outline="")
+                                        
+            canvas.create_text(10, 10, anchor=tk.NW, fill="#888888",
+                               text=f"{profile.name}: histogram estimated from {len(profile.sample):,} sampled values "
+                                    f"(peak bin ≈ {peak:,})")
+            canvas.create_text(10, height - 12, anchor=tk.W, fill="white", text=f"{bins[0][0]:g}")
+            canvas.create_text(width - 10, height - 12, anchor=tk.E, fill="white", text=f"{bins[-1][1]:g}")
+            
+        tree.bind('<<TreeviewSelect>>', draw_histogram)
+        canvas.bind('<Configure>', draw_histogram)
+        
+        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=(0, 10))
+        self.set_status(f"Profile of {table_name} completed")
+        
     def execute_query(self):
         if not self.conn:
             messagebox.showwarning("Warning", "Please open a database first.")
@@ -1020,48 +4162,25 @@ class SQLiteManager(tk.Tk):
             return
             
         try:
-            start_time = datetime.now()
-            self.cursor.execute(query)
-            
-       
-            if query.upper().strip().startswith('SELECT'):
-                rows = self.cursor.fetchall()
-                columns = [desc[0] for desc in self.cursor.description]
-                
-                self.clear_tree(self.result_tree)
-                self.result_tree['columns'] = columns
-                self.result_tree.column('#0', width=0, stretch=tk.NO)
-                
-                for col in columns:
-                    self.result_tree.column(col, width=120)
-                    self.result_tree.heading(col, text=col)
-                    
-                for row in rows:
-                    self.result_tree.insert('', tk.END, values=row)
-                    
-                exec_time = (datetime.now() - start_time).total_seconds()
-                self.result_label.config(text=f"Rows: {len(rows)} | Time: {exec_time:.3f}s")
-                
-            else:
-                self.conn.commit()
-                exec_time = (datetime.now() - start_time).total_seconds()
-                affected = self.cursor.rowcount
-                self.result_label.config(text=f"Query successful | Affected rows: {affected} | Time: {exec_time:.3f}s")
-                self.clear_tree(self.result_tree)
-                self.refresh_tables()
-                self.refresh_schema()
-                if self.current_table:
-                    self.refresh_data()
-                    
-   
-            self.query_history.append({
-                'query': query,
-                'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'success': True
-            })
-            
-            self.set_status("Query executed successfully")
+            statements = [(line_no, sql) for line_no, sql in iter_sql_statements(query.splitlines(keepends=True))
+                          if statement_keyword(sql)]
+            positional, names = find_parameters(query)
+            if positional and names:
+                raise ValueError("Positional (?) and named (:name) parameters cannot be mixed")
+            self.update_parameter_panel()
             
+            start_time = datetime.now()
+            if (positional or names) and self.each_row_var.get():
+                if len(statements) != 1:
+                    raise ValueError("Run for each row works on a single statement")
+                self.execute_for_each_row(statements[0][1], positional, names, start_time)
+                self.query_history.append({
+                    'query': query,
+                    'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    'success': True
+                })
+                return
+            values = self.parameter_values(positional, names)
         except Exception as e:
             messagebox.showerror("Error", f"Query failed:\n{e}")
             self.query_history.append({
@@ -1070,7 +4189,551 @@ class SQLiteManager(tk.Tk):
                 'success': False,
                 'error': str(e)
             })
+            return
+            
+        errors = self.run_script(statements, values)
+        
+        entry = {
+            'query': query,
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'success': not errors
+        }
+        if errors:
+            entry['error'] = "; ".join(f"line {line_no}: {e}" for line_no, e in errors)
+        self.query_history.append(entry)
+        
+        if errors:
+            line_no, e = errors[0]
+            more = f"\n({len(errors)} statements failed)" if len(errors) > 1 else ""
+            messagebox.showerror("Error", f"Query failed at line {line_no}:\n{e}{more}")
+        else:
+            self.set_status("Query executed successfully")
+            
+    def run_script(self, statements, values):
+        self.clear_results()
+        single = self.script_transaction_var.get() and not any(is_transaction_control(sql) for _, sql in statements)
+        stop_on_error = self.stop_on_error_var.get()
+        errors = []
+        changed = False
+        user_transaction = False
+        executed = 0
+        script_start = time.perf_counter()
+        bound = bind_script_parameters([sql for _, sql in statements], values)
+        
+        if self.conn.in_transaction:
+            self.conn.commit()
+        if single:
+            self.cursor.execute("BEGIN")
+            
+        for number, ((line_no, sql), (_, params)) in enumerate(zip(statements, bound), 1):
+            keyword = statement_keyword(sql)
+            started = time.perf_counter()
+            error = None
+            try:
+                self.cursor.execute(sql, params)
+                if self.cursor.description:
+                    if len(self.result_sets) < MAX_RESULT_TABS:
+                        columns, rows, store = read_result_set(self.cursor, self.result_memory_budget)
+                        result = ResultSet(f"Result {len(self.result_sets) + 1}", columns, rows, store,
+                                           time.perf_counter() - started)
+                        self.add_result_tab(result, number)
+                        count = result.count
+                    else:
+                        count = sum(len(batch) for batch in iter(lambda: self.cursor.fetchmany(RESULT_FETCH_SIZE), []))
+                    rows_text = f"{count:,} returned"
+                    changed = changed or keyword not in ('SELECT', 'WITH', 'VALUES', 'EXPLAIN', 'PRAGMA')
+                else:
+                    rows_text = f"{self.cursor.rowcount:,} affected" if self.cursor.rowcount >= 0 else ""
+                    changed = True
+                    
+                if keyword == 'BEGIN':
+                    user_transaction = True
+                elif is_transaction_control(sql):
+                    user_transaction = False
+                if not single and not user_transaction and self.conn.in_transaction:
+                    self.conn.commit()
+            except Exception as e:
+                error = e
+                errors.append((line_no, e))
+                rows_text = ""
+                
+            elapsed = time.perf_counter() - started
+            executed += 1
+            summary = " ".join(sql.split())
+            self.statement_tree.insert('', tk.END, iid=str(number), tags=('error',) if error else (),
+                                       values=(number, line_no, summary[:200], f"{elapsed * 1000:,.1f}", rows_text,
+                                               f"Error: {error}" if error else "OK"))
+            if error and stop_on_error:
+                break
+                
+        rolled_back = False
+        if self.conn.in_transaction:
+            if errors and stop_on_error:
+                self.conn.rollback()
+                rolled_back = True
+            else:
+                self.conn.commit()
+                
+        total = time.perf_counter() - script_start
+        text = f"Statements: {executed} of {len(statements)} | Errors: {len(errors)} | Time: {total:.3f}s"
+        if single:
+            text += " | Rolled back" if rolled_back else " | Committed as one transaction"
+        elif rolled_back:
+            text += " | Open transaction rolled back"
+        self.result_label.config(text=text)
+        
+        if self.result_sets and not errors:
+            self.result_notebook.select(self.result_sets[0].tab)
+        else:
+            self.result_notebook.select(self.result_notebook.tabs()[0])
+        self.update_result_page_label()
+        
+        if changed:
+            self.sync_attached()
+            self.refresh_tables()
+            self.refresh_schema()
+            if self.current_table:
+                self.refresh_data()
+        return errors
+        
+    def update_parameter_panel(self, event=None):
+        positional, names = find_parameters(self.query_text.get(1.0, tk.END))
+        keys = [f"?{i}" for i in range(1, positional + 1)] + [f":{name}" for name in names]
+        if keys == list(self.param_entries):
+            return
+            
+        previous = {key: entry.get() for key, entry in self.param_entries.items()}
+        for child in self.param_grid.winfo_children():
+            child.destroy()
+        self.param_entries = {}
+        
+        if not keys:
+            ttk.Label(self.param_grid, text="No ? or :name placeholders in the query",
+                      foreground="#888888").grid(row=0, column=0, sticky=tk.W)
+            return
+            
+        for i, key in enumerate(keys):
+            ttk.Label(self.param_grid, text=key).grid(row=i // 4, column=(i % 4) * 2, sticky=tk.E, padx=(5, 2), pady=2)
+            entry = tk.Entry(self.param_grid, width=18, bg="#2d2d2d", fg="white", insertbackground="white",
+                             relief=tk.FLAT)
+            entry.grid(row=i // 4, column=(i % 4) * 2 + 1, sticky=tk.W, pady=2)
+            entry.insert(0, previous.get(key, ''))
+            self.param_entries[key] = entry
+            
+    def parameter_values(self, positional, names):
+        if names:
+            return {name: coerce_parameter(self.param_entries[f":{name}"].get()) for name in names}
+        return [coerce_parameter(self.param_entries[f"?{i}"].get()) for i in range(1, positional + 1)]
+        
+    def load_parameter_csv(self):
+        file_path = filedialog.askopenfilename(
+            title="Load Parameter Rows",
+            filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")]
+        )
+        if file_path:
+            self.param_source = {'path': file_path}
+            self.each_row_var.set(True)
+            self.param_source_label.config(text=f"CSV: {os.path.basename(file_path)}", foreground="white")
+            
+    def paste_parameter_grid(self):
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            messagebox.showwarning("Warning", "The clipboard is empty.")
+            return
+            
+        lines = text.splitlines()
+        delimiter = '\t' if lines and '\t' in lines[0] else ','
+        rows = [row for row in csv.reader(lines, delimiter=delimiter) if row]
+        if not rows:
+            messagebox.showwarning("Warning", "The clipboard contains no rows.")
+            return
+            
+        self.param_source = {'rows': rows}
+        self.each_row_var.set(True)
+        self.param_source_label.config(text=f"Grid: {len(rows):,} rows", foreground="white")
+        
+    def execute_for_each_row(self, query, positional, names, start_time):
+        if not self.param_source:
+            raise ValueError("Load a CSV file or paste a grid to run the query for each row")
+        if statement_keyword(query) in ('SELECT', 'PRAGMA', 'EXPLAIN', 'VALUES'):
+            raise ValueError("Run for each row needs an INSERT, UPDATE, DELETE or REPLACE statement")
+            
+        header = self.param_header_var.get()
+        source = self.param_source
+        try:
+            if 'path' in source:
+                with open(source['path'], newline='', encoding='utf-8') as f:
+                    self.cursor.executemany(query, iter_parameter_rows(csv.reader(f), positional, names, header))
+            else:
+                self.cursor.executemany(query, iter_parameter_rows(source['rows'], positional, names, header))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+            
+        exec_time = (datetime.now() - start_time).total_seconds()
+        affected = self.cursor.rowcount
+        self.clear_results()
+        self.result_label.config(text=f"Batch successful | Affected rows: {affected:,} | Time: {exec_time:.3f}s")
+        self.refresh_tables()
+        if self.current_table:
+            self.refresh_data()
+        self.set_status(f"Batch executed: {affected:,} rows affected")
+        
+    def clear_results(self):
+        for result in self.result_sets:
+            self.result_notebook.forget(result.tab)
+            result.tab.destroy()
+        self.workspace.discard_results()
+        self.clear_tree(self.statement_tree)
+        self.result_filter_entry.delete(0, tk.END)
+        self.result_page_label.config(text="")
+        
+    def add_result_tab(self, result, statement_number):
+        frame = ttk.Frame(self.result_notebook)
+        
+        vsb = ttk.Scrollbar(frame, orient="vertical")
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        hsb = ttk.Scrollbar(frame, orient="horizontal")
+        hsb.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        tree = ttk.Treeview(frame, yscrollcommand=vsb.set, xscrollcommand=hsb.set,
+                            columns=[f"c{i}" for i in range(len(result.columns))])
+        tree.pack(fill=tk.BOTH, expand=True)
+        vsb.config(command=tree.yview)
+        hsb.config(command=tree.xview)
+        
+        tree.column('#0', width=0, stretch=tk.NO)
+        for i in range(len(result.columns)):
+            tree.column(f"c{i}", width=120)
+            
+        result.tab = frame
+        result.tree = tree
+        result.statement = str(statement_number)
+        self.result_sets.append(result)
+        self.result_notebook.add(frame, text=f"{result.title} ({result.count:,})")
+        self.show_results(result)
+        
+    def active_result(self):
+        selected = str(self.result_notebook.select())
+        for result in self.result_sets:
+            if str(result.tab) == selected:
+                return result
+        return None
+        
+    def show_statement_result(self, event=None):
+        selection = self.statement_tree.selection()
+        for result in self.result_sets:
+            if selection and result.statement == selection[0]:
+                self.result_notebook.select(result.tab)
+                return
+                
+    def show_results(self, result):
+        total, rows = result.page()
+        for i, col in enumerate(result.columns):
+            arrow = (' ▼' if result.descending else ' ▲') if result.order == i else ''
+            result.tree.heading(f"c{i}", text=col + arrow, command=lambda i=i: self.sort_results(result, i))
+            
+        self.clear_tree(result.tree)
+        for row in rows:
+            result.tree.insert('', tk.END, values=[clip_cell(value) for value in row])
+        result.shown = (total, len(rows))
+        self.update_result_page_label()
+        
+    def update_result_page_label(self):
+        result = self.active_result()
+        if result is None:
+            self.result_page_label.config(text="")
+            return
+            
+        total, shown = result.shown
+        text = f"Rows: {total:,}"
+        if total > shown:
+            text += f" | Showing {result.offset + 1:,}–{result.offset + shown:,}"
+        if result.store:
+            text += f" | Spilled to disk (budget {format_size(self.result_memory_budget)})"
+        self.result_page_label.config(text=text + f" | Time: {result.elapsed:.3f}s")
+        
+    def sort_results(self, result, index):
+        result.descending = result.order == index and not result.descending
+        result.order = index
+        result.offset = 0
+        self.show_results(result)
+        
+    def filter_results(self):
+        result = self.active_result()
+        if result is None:
+            return
+        result.filter = self.result_filter_entry.get()
+        result.offset = 0
+        self.show_results(result)
+        
+    def page_results(self, step):
+        result = self.active_result()
+        if result is None:
+            return
+        result.offset = max(0, result.offset + step * RESULT_PAGE_SIZE)
+        self.show_results(result)
+        
+    def set_result_memory_budget(self):
+        budget = simpledialog.askinteger("Result Memory Budget",
+                                         "Maximum MB of query results kept in memory before spilling to disk:",
+                                         initialvalue=self.result_memory_budget >> 20, minvalue=1, parent=self)
+        if budget:
+            self.result_memory_budget = budget << 20
+            self.set_status(f"Result memory budget: {budget} MB")
+            
+    def benchmark_query(self):
+        if not self.conn:
+            messagebox.showwarning("Warning", "Please open a database first.")
+            return
             
+        query = self.query_text.get(1.0, tk.END).strip()
+        if not query:
+            messagebox.showwarning("Warning", "Please enter an SQL query.")
+            return
+            
+        dialog = tk.Toplevel(self)
+        dialog.title("Benchmark Query")
+        dialog.geometry("600x450")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        options = ttk.Frame(dialog)
+        options.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(options, text="Warm runs:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        runs_spin = ttk.Spinbox(options, from_=1, to=10000, width=10)
+        runs_spin.set(10)
+        runs_spin.grid(row=0, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(options, text="Cold runs:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        cold_spin = ttk.Spinbox(options, from_=0, to=1000, width=10)
+        cold_spin.set(0)
+        cold_spin.grid(row=1, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(options, text="Cold cache_size (pages):").grid(row=2, column=0, sticky=tk.W, pady=3)
+        cache_spin = ttk.Spinbox(options, from_=1, to=100000, width=10)
+        cache_spin.set(100)
+        cache_spin.grid(row=2, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(dialog, text="Every run is rolled back, so the benchmark never changes data. "
+                               "Cold runs each use a fresh connection with an empty page cache.",
+                  foreground="#888888", wraplength=560).pack(fill=tk.X, padx=10)
+                  
+        variant_frame = ttk.LabelFrame(dialog, text="Variant B (optional, compared with the editor query)",
+                                       padding=5)
+        variant_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        variant_text = tk.Text(variant_frame, height=8, bg="#2d2d2d", fg="white",
+                               insertbackground="white", font=("Consolas", 10), relief=tk.FLAT)
+        variant_text.pack(fill=tk.BOTH, expand=True)
+        
+        def prepare(sql_text):
+            positional, names = find_parameters(sql_text)
+            if positional and names:
+                raise ValueError("Positional (?) and named (:name) parameters cannot be mixed")
+            keys = [f"?{i}" for i in range(1, positional + 1)] + [f":{name}" for name in names]
+            missing = [key for key in keys if key not in self.param_entries]
+            if missing:
+                raise ValueError(f"No value for {', '.join(missing)} in the parameter panel")
+            statements = [sql for _, sql in iter_sql_statements(sql_text.splitlines(keepends=True))
+                          if statement_keyword(sql)]
+            if any(is_transaction_control(sql) for sql in statements):
+                raise ValueError("Benchmarks run inside a transaction that is rolled back; "
+                                 "remove BEGIN/COMMIT/ROLLBACK statements")
+            return bind_script_parameters(statements, self.parameter_values(positional, names))
+            
+        def start():
+            try:
+                runs = max(1, int(runs_spin.get()))
+                cold_runs = max(0, int(cold_spin.get()))
+                cache_size = max(1, int(cache_spin.get()))
+            except ValueError:
+                messagebox.showwarning("Warning", "Runs and cache size must be whole numbers.", parent=dialog)
+                return
+                
+            variant = variant_text.get(1.0, tk.END).strip()
+            try:
+                self.update_parameter_panel()
+                variants = [('A', query, prepare(query))]
+                if variant:
+                    variants.append(('B', variant, prepare(variant)))
+            except Exception as e:
+                messagebox.showerror("Error", f"Cannot benchmark the query:\n{e}", parent=dialog)
+                return
+            dialog.destroy()
+            self.run_benchmark(variants, runs, cold_runs, cache_size)
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        ttk.Button(btn_frame, text="Run", command=start, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def run_benchmark(self, variants, runs, cold_runs, cache_size):
+        connect = self.worker_connector()
+        total = len(variants) * (runs + 1 + cold_runs)
+        
+        def work(task):
+            results = []
+            step = 0
+            for name, query, bound in variants:
+                stats = {}
+                timings = []
+                conn = connect()
+                try:
+                    for i in range(runs + 1):
+                        task.check_cancelled()
+                        task.report(f"Variant {name}: " + (f"warm run {i} of {runs}" if i else "warm-up run"),
+                                    step / total)
+                        elapsed, rows = time_statements(conn, bound)
+                        if i:
+                            timings.append(elapsed)
+                        step += 1
+                finally:
+                    conn.close()
+                stats['warm'] = summarize_timings(timings, rows)
+                
+                timings = []
+                for i in range(cold_runs):
+                    task.check_cancelled()
+                    task.report(f"Variant {name}: cold run {i + 1} of {cold_runs}", step / total)
+                    conn = connect()
+                    try:
+                        conn.execute(f"PRAGMA cache_size = {cache_size}")
+                        elapsed, rows = time_statements(conn, bound)
+                    finally:
+                        conn.close()
+                    timings.append(elapsed)
+                    step += 1
+                if timings:
+                    stats['cold'] = summarize_timings(timings, rows)
+                results.append((name, query, stats))
+            return results
+            
+        def done(results):
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for name, query, stats in results:
+                self.query_history.append({
+                    'query': query,
+                    'time': now,
+                    'success': True,
+                    'benchmark': stats
+                })
+            self.show_benchmark_results(results)
+            self.set_status("Benchmark finished")
+            
+        self.run_background("Benchmark", work, done)
+        
+    def show_benchmark_results(self, results):
+        dialog = tk.Toplevel(self)
+        dialog.title("Benchmark Results")
+        dialog.geometry("800x350")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        columns = ('Mode', 'Runs', 'Min', 'Median', 'p95', 'Max', 'Rows', 'Rows/s')
+        tree = ttk.Treeview(dialog, columns=columns, height=6)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        tree.column('#0', width=180)
+        tree.heading('#0', text='Variant')
+        for col in columns:
+            tree.column(col, width=75, anchor=tk.E)
+            tree.heading(col, text=col if col in ('Mode', 'Runs', 'Rows', 'Rows/s') else f"{col} (ms)")
+            
+        lines = ["Variant\t" + "\t".join(columns)]
+        for name, query, stats in results:
+            preview = " ".join(query.split())
+            for mode, s in stats.items():
+                rate = f"{s['rows_per_sec']:,.0f}" if s['rows_per_sec'] is not None else "-"
+                values = (mode, s['runs'], f"{s['min'] * 1000:,.2f}", f"{s['median'] * 1000:,.2f}",
+                          f"{s['p95'] * 1000:,.2f}", f"{s['max'] * 1000:,.2f}", f"{s['rows']:,}", rate)
+                tree.insert('', tk.END, text=f"{name}: {preview[:40]}", values=values)
+                lines.append(f"{name}\t" + "\t".join(map(str, values)))
+                
+        if len(results) == 2:
+            a, b = results[0][2], results[1][2]
+            comparison = []
+            for mode in a:
+                if mode in b and a[mode]['median'] > 0:
+                    ratio = b[mode]['median'] / a[mode]['median']
+                    comparison.append(f"{mode.title()}: B takes {ratio:.2f}× the median time of A")
+            ttk.Label(dialog, text="   |   ".join(comparison)).pack(padx=10, anchor=tk.W)
+            lines.extend(comparison)
+            
+        def copy():
+            self.clipboard_clear()
+            self.clipboard_append("\n".join(lines))
+            self.set_status("Benchmark results copied")
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Button(btn_frame, text="Copy", command=copy).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def export_query_results(self):
+        if not self.conn:
+            messagebox.showwarning("Warning", "Please open a database first.")
+            return
+        
+        query = self.query_text.get(1.0, tk.END).strip()
+        if not query:
+            messagebox.showwarning("Warning", "Please enter an SQL query.")
+            return
+        
+        try:
+            positional, names = find_parameters(query)
+            if positional and names:
+                raise ValueError("Positional (?) and named (:name) parameters cannot be mixed")
+            self.update_parameter_panel()
+            statements = [sql for _, sql in iter_sql_statements(query.splitlines(keepends=True))
+                          if statement_keyword(sql)]
+            if any(is_transaction_control(sql) for sql in statements):
+                raise ValueError("Exports run inside a transaction that is rolled back; "
+                                 "remove BEGIN/COMMIT/ROLLBACK statements")
+            bound = bind_script_parameters(statements, self.parameter_values(positional, names))
+        except Exception as e:
+            messagebox.showerror("Error", f"Cannot export the query results:\n{e}")
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Export Query Results",
+            defaultextension=".csv",
+            filetypes=[("CSV Files", "*.csv *.csv.gz *.csv.xz"),
+                       ("NDJSON Files", "*.ndjson *.jsonl *.ndjson.gz *.jsonl.gz"),
+                       ("JSON Files", "*.json *.json.gz *.json.xz"), ("All Files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        base = re.sub(r'\.(gz|xz)$', '', file_path.lower())
+        fmt = 'ndjson' if base.endswith(('.ndjson', '.jsonl')) else 'json' if base.endswith('.json') else 'csv'
+        self.run_query_export(file_path, fmt, bound)
+    
+    def run_query_export(self, file_path, fmt, bound):
+        connect = self.worker_connector()
+        
+        def work(task):
+            conn = connect()
+            try:
+                with open_text_file(file_path, 'w') as out:
+                    return write_query_results(conn, out, bound, fmt, task)
+            except BaseException:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                raise
+            finally:
+                conn.close()
+        
+        def done(result):
+            rows, elapsed = result
+            messagebox.showinfo("Success", f"{rows:,} rows exported in {elapsed:.1f}s to:\n{file_path}")
+            self.set_status(f"Query results exported: {rows:,} rows")
+        
+        self.run_background("Export Query Results", work, done)
+        
     def clear_query(self):
         self.query_text.delete(1.0, tk.END)
         
@@ -1101,6 +4764,8 @@ class SQLiteManager(tk.Tk):
         
         for entry in reversed(self.query_history[-50:]):  # Letzte 50
             status = '✓ Success' if entry['success'] else '✗ Error'
+            if 'benchmark' in entry:
+                status = f"⏱ {entry['benchmark']['warm']['median'] * 1000:,.1f} ms"
             query_preview = entry['query'][:60] + '...' if len(entry['query']) > 60 else entry['query']
             tree.insert('', 0, text=query_preview, values=(entry['time'], status))
             
@@ -1206,75 +4871,82 @@ class SQLiteManager(tk.Tk):
         self.clear_tree(self.schema_tree)
         
         try:
-
-            self.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='table' ORDER BY name")
-            tables = self.cursor.fetchall()
-            
-            for table in tables:
-                table_name = table[0]
-                table_sql = table[1]
-                
-                table_node = self.schema_tree.insert('', tk.END, text=table_name, 
-                                                     values=('Table', ''), tags=('table',))
+            self.insert_schema_objects('main', '')
+            for alias, path in self.attached.items():
+                root = self.schema_tree.insert('', tk.END, iid=f"schema:{alias}", text=f"🗄️ {alias}",
+                                               values=('Database', path), tags=('category',))
+                self.insert_schema_objects(alias, root)
                 
+            self.workspace.watch_versions = self.database_versions()
+            self.rowid_histograms.clear()
+        except Exception as e:
+            messagebox.showerror("Error", f"Schema could not be loaded:\n{e}")
+            
+    def insert_schema_objects(self, schema, parent):
+        self.cursor.execute(f"SELECT name, sql FROM {schema}.sqlite_master WHERE type='table' ORDER BY name")
+        tables = self.cursor.fetchall()
+        
+        for table in tables:
+            table_name = table[0]
+            table_sql = table[1]
+            
+            table_node = self.schema_tree.insert(parent, tk.END, text=table_name, 
+                                                 values=('Table', ''), tags=('table',))
+            
 
-                self.cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = self.cursor.fetchall()
+            columns = self.table_info(f"{schema}.{table_name}")
+            
+            for col in columns:
+                col_name = col[1]
+                col_type = col[2]
+                not_null = col[3]
+                default = col[4]
+                pk = col[5]
                 
-                for col in columns:
-                    col_name = col[1]
-                    col_type = col[2]
-                    not_null = col[3]
-                    default = col[4]
-                    pk = col[5]
+                details = []
+                if pk:
+                    details.append("PRIMARY KEY")
+                if not_null:
+                    details.append("NOT NULL")
+                if default:
+                    details.append(f"DEFAULT {default}")
                     
-                    details = []
-                    if pk:
-                        details.append("PRIMARY KEY")
-                    if not_null:
-                        details.append("NOT NULL")
-                    if default:
-                        details.append(f"DEFAULT {default}")
-                        
-                    self.schema_tree.insert(table_node, tk.END, text=col_name,
-                                          values=(col_type, ', '.join(details)))
-                                          
+                self.schema_tree.insert(table_node, tk.END, text=col_name,
+                                      values=(col_type, ', '.join(details)))
+                                      
    
-            self.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='index' ORDER BY name")
-            indexes = self.cursor.fetchall()
-            
-            if indexes:
-                index_root = self.schema_tree.insert('', tk.END, text='📑 Indexes', 
-                                                     values=('', ''), tags=('category',))
-                for idx in indexes:
-                    if idx[0] and not idx[0].startswith('sqlite_'):
-                        self.schema_tree.insert(index_root, tk.END, text=idx[0],
-                                              values=('Index', idx[1] if idx[1] else ''))
-                                          
+        self.cursor.execute(f"SELECT name, sql FROM {schema}.sqlite_master WHERE type='index' ORDER BY name")
+        indexes = self.cursor.fetchall()
+        
+        if indexes:
+            index_root = self.schema_tree.insert(parent, tk.END, text='📑 Indexes', 
+                                                 values=('', ''), tags=('category',))
+            for idx in indexes:
+                if idx[0] and not idx[0].startswith('sqlite_'):
+                    self.schema_tree.insert(index_root, tk.END, text=idx[0],
+                                          values=('Index', idx[1] if idx[1] else ''))
+                                      
   
-            self.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='view' ORDER BY name")
-            views = self.cursor.fetchall()
-            
-            if views:
-                view_root = self.schema_tree.insert('', tk.END, text='👁️ Views', 
-                                                    values=('', ''), tags=('category',))
-                for view in views:
-                    self.schema_tree.insert(view_root, tk.END, text=view[0],
-                                          values=('View', view[1] if view[1] else ''))
-                                          
-    
-            self.cursor.execute("SELECT name, sql FROM sqlite_master WHERE type='trigger' ORDER BY name")
-            triggers = self.cursor.fetchall()
-            
-            if triggers:
-                trigger_root = self.schema_tree.insert('', tk.END, text='⚡ Triggers',
-                                                      values=('', ''), tags=('category',))
-                for trigger in triggers:
-                    self.schema_tree.insert(trigger_root, tk.END, text=trigger[0],
-                                          values=('Trigger', trigger[1] if trigger[1] else ''))
-                                          
-        except Exception as e:
-            messagebox.showerror("Error", f"Schema could not be loaded:\n{e}")
+        self.cursor.execute(f"SELECT name, sql FROM {schema}.sqlite_master WHERE type='view' ORDER BY name")
+        views = self.cursor.fetchall()
+        
+        if views:
+            view_root = self.schema_tree.insert(parent, tk.END, text='👁️ Views', 
+                                                values=('', ''), tags=('category',))
+            for view in views:
+                self.schema_tree.insert(view_root, tk.END, text=view[0],
+                                      values=('View', view[1] if view[1] else ''))
+                                      
+
+        self.cursor.execute(f"SELECT name, sql FROM {schema}.sqlite_master WHERE type='trigger' ORDER BY name")
+        triggers = self.cursor.fetchall()
+        
+        if triggers:
+            trigger_root = self.schema_tree.insert(parent, tk.END, text='⚡ Triggers',
+                                                  values=('', ''), tags=('category',))
+            for trigger in triggers:
+                self.schema_tree.insert(trigger_root, tk.END, text=trigger[0],
+                                      values=('Trigger', trigger[1] if trigger[1] else ''))
             
     def copy_ddl(self):
         selection = self.schema_tree.selection()
@@ -1285,8 +4957,13 @@ class SQLiteManager(tk.Tk):
         item = self.schema_tree.item(selection[0])
         item_text = item['text']
         
+        root = selection[0]
+        while self.schema_tree.parent(root):
+            root = self.schema_tree.parent(root)
+        schema = root[len("schema:"):] if root.startswith("schema:") else 'main'
+        
         try:
-            self.cursor.execute(f"SELECT sql FROM sqlite_master WHERE name='{item_text}'")
+            self.cursor.execute(f"SELECT sql FROM {schema}.sqlite_master WHERE name = ?", (item_text,))
             result = self.cursor.fetchone()
             
             if result and result[0]:
@@ -1325,22 +5002,96 @@ class SQLiteManager(tk.Tk):
         ttk.Button(dialog, text="Cancel", command=dialog.destroy).pack(pady=10)
         
     def export_sql(self):
-        file_path = filedialog.asksaveasfilename(
-            title="Save SQL Dump",
-            defaultextension=".sql",
-            filetypes=[("SQL Files", "*.sql"), ("All Files", "*.*")]
-        )
+        try:
+            shadows = shadow_tables(self.cursor)
+            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name")
+            tables = [row[0] for row in self.cursor.fetchall() if row[0] not in shadows]
+        except Exception as e:
+            messagebox.showerror("Error", f"Tables could not be loaded:\n{e}")
+            return
+            
+        dialog = tk.Toplevel(self)
+        dialog.title("SQL Dump Options")
+        dialog.geometry("400x450")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
         
-        if file_path:
+        table_frame = ttk.LabelFrame(dialog, text="Tables", padding=10)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        table_scroll = ttk.Scrollbar(table_frame)
+        table_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        table_list = tk.Listbox(table_frame, selectmode=tk.EXTENDED, yscrollcommand=table_scroll.set,
+                                bg="#2d2d2d", fg="white", selectbackground="#0078d4",
+                                relief=tk.FLAT, activestyle='none', exportselection=False)
+        table_list.pack(fill=tk.BOTH, expand=True)
+        table_scroll.config(command=table_list.yview)
+        for table in tables:
+            table_list.insert(tk.END, table)
+        table_list.selection_set(0, tk.END)
+        
+        options = ttk.Frame(dialog)
+        options.pack(fill=tk.X, padx=10)
+        
+        ttk.Label(options, text="Compression:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        compression_combo = ttk.Combobox(options, state='readonly', width=10, values=('None', 'gzip', 'xz'))
+        compression_combo.current(0)
+        compression_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(options, text="Rows per INSERT:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        rows_spin = ttk.Spinbox(options, from_=1, to=10000, width=10)
+        rows_spin.set(500)
+        rows_spin.grid(row=1, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        def export():
+            selected = [table_list.get(i) for i in table_list.curselection()]
+            if not selected:
+                messagebox.showwarning("Warning", "Please select at least one table.", parent=dialog)
+                return
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    for line in self.conn.iterdump():
-                        f.write(f'{line}\n')
-                        
-                messagebox.showinfo("Success", f"Database successfully exported to:\n{file_path}")
-                self.set_status("SQL dump exported successfully")
-            except Exception as e:
-                messagebox.showerror("Error", f"Export failed:\n{e}")
+                rows_per_insert = max(1, int(rows_spin.get()))
+            except ValueError:
+                rows_per_insert = 500
+            compression = {'gzip': 'gzip', 'xz': 'xz'}.get(compression_combo.get())
+            extension = {'gzip': '.sql.gz', 'xz': '.sql.xz'}.get(compression, '.sql')
+            
+            file_path = filedialog.asksaveasfilename(
+                title="Save SQL Dump",
+                defaultextension=extension,
+                filetypes=[("SQL Files", "*.sql *.sql.gz *.sql.xz"), ("All Files", "*.*")]
+            )
+            if not file_path:
+                return
+            dialog.destroy()
+            self.run_sql_dump(file_path, selected, rows_per_insert, compression)
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Button(btn_frame, text="Export", command=export, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def run_sql_dump(self, file_path, tables, rows_per_insert=500, compression=None):
+        connect = self.worker_connector()
+        
+        def work(task):
+            conn = connect()
+            try:
+                with open_text_file(file_path, 'w', compression) as out:
+                    return write_sql_dump(conn, out, tables, rows_per_insert, task)
+            except BaseException:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                raise
+            finally:
+                conn.close()
+                
+        def done(total_rows):
+            messagebox.showinfo("Success", f"{len(tables)} tables ({total_rows:,} rows) exported to:\n{file_path}")
+            self.set_status("SQL dump exported successfully")
+            
+        self.run_background("SQL Dump", work, done)
                 
     def export_all_csv(self):
         folder = filedialog.askdirectory(title="Choose folder for CSV export")
@@ -1436,7 +5187,7 @@ class SQLiteManager(tk.Tk):
             
         dialog = tk.Toplevel(self)
         dialog.title("Import Data")
-        dialog.geometry("400x200")
+        dialog.geometry("400x240")
         dialog.configure(bg="#1e1e1e")
         dialog.transient(self)
         dialog.grab_set()
@@ -1448,30 +5199,53 @@ class SQLiteManager(tk.Tk):
                   style="Accent.TButton").pack(fill=tk.X, padx=50, pady=5)
         ttk.Button(dialog, text="📊 CSV File",
                   command=lambda: [self.import_csv(), dialog.destroy()]).pack(fill=tk.X, padx=50, pady=5)
+        ttk.Button(dialog, text="🧾 JSON / NDJSON File",
+                  command=lambda: [self.import_json(), dialog.destroy()]).pack(fill=tk.X, padx=50, pady=5)
         
         ttk.Button(dialog, text="Cancel", command=dialog.destroy).pack(pady=10)
         
     def import_sql(self):
         file_path = filedialog.askopenfilename(
             title="Import SQL File",
-            filetypes=[("SQL Files", "*.sql"), ("All Files", "*.*")]
+            filetypes=[("SQL Files", "*.sql *.sql.gz *.sql.xz"), ("All Files", "*.*")]
         )
         
-        if file_path:
+        if not file_path:
+            return
+            
+        batch_size = simpledialog.askinteger("Batch size", "Statements per transaction:",
+                                             initialvalue=1000, minvalue=1)
+        if not batch_size:
+            return
+            
+        connect = self.worker_connector()
+        optimize = self.optimize_var.get()
+        analysis_limit = self.analysis_limit
+        
+        def work(task):
+            conn = connect()
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    sql_script = f.read()
-                    
-                self.cursor.executescript(sql_script)
-                self.conn.commit()
+                result = import_sql_stream(conn, file_path, batch_size, task)
+                if optimize:
+                    optimize_after_import(conn, analysis_limit, None, task)
+                return result
+            finally:
+                conn.close()
                 
+        def done(result):
+            executed, elapsed = result
+            messagebox.showinfo("Success", f"SQL file imported successfully.\n{executed:,} statements in {elapsed:.1f}s")
+            self.set_status("SQL import successful")
+            
+        workspace = self.workspace
+        
+        def finish():
+            self.reload_planner_stats(workspace)
+            if self.workspace is workspace:
                 self.refresh_tables()
                 self.refresh_schema()
                 
-                messagebox.showinfo("Success", "SQL file imported successfully.")
-                self.set_status("SQL import successful")
-            except Exception as e:
-                messagebox.showerror("Error", f"Import failed:\n{e}")
+        self.run_background("SQL Import", work, done, finish)
                 
     def import_csv(self):
         file_path = filedialog.askopenfilename(
@@ -1482,56 +5256,170 @@ class SQLiteManager(tk.Tk):
         if not file_path:
             return
             
-        table_name = simpledialog.askstring("Table name", 
-                                           "Name for the new table:",
-                                           initialvalue=os.path.splitext(os.path.basename(file_path))[0])
+        dialog = tk.Toplevel(self)
+        dialog.title("Import CSV")
+        dialog.geometry("420x200")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
         
-        if not table_name:
-            return
+        options = ttk.Frame(dialog)
+        options.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(options, text="Table name:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        name_entry = tk.Entry(options, width=28, bg="#2d2d2d", fg="white", insertbackground="white", relief=tk.FLAT)
+        name_entry.insert(0, os.path.splitext(os.path.basename(file_path))[0])
+        name_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(options, text="Parser processes:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        workers_spin = ttk.Spinbox(options, from_=1, to=64, width=10)
+        workers_spin.set(os.cpu_count() or 1)
+        workers_spin.grid(row=1, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        order_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Preserve row order", variable=order_var).grid(
+            row=2, column=0, columnspan=2, sticky=tk.W, pady=3)
             
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                headers = next(reader)
-                first_row = next(reader)
-                
-                
-                col_defs = []
-                for i, header in enumerate(headers):
-                    col_name = header.strip().replace(' ', '_')
-                    try:
-                        float(first_row[i])
-                        col_type = "REAL" if '.' in first_row[i] else "INTEGER"
-                    except:
-                        col_type = "TEXT"
-                    col_defs.append(f"{col_name} {col_type}")
-                
-                
-                create_sql = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(col_defs)})"
-                self.cursor.execute(create_sql)
+        def start():
+            table_name = name_entry.get().strip()
+            if not table_name:
+                messagebox.showwarning("Warning", "Please enter a table name.", parent=dialog)
+                return
+            try:
+                workers = max(1, int(workers_spin.get()))
+            except ValueError:
+                workers = os.cpu_count() or 1
+            dialog.destroy()
+            self.run_csv_import(file_path, table_name, workers, order_var.get())
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Button(btn_frame, text="Import", command=start, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def run_csv_import(self, file_path, table_name, workers, preserve_order=True):
+        connect = self.worker_connector()
+        optimize = self.optimize_var.get()
+        analysis_limit = self.analysis_limit
+        
+        def work(task):
+            conn = connect()
+            try:
+                result = import_csv_stream(conn, file_path, table_name, workers, preserve_order, task)
+                if optimize:
+                    optimize_after_import(conn, analysis_limit, [quote_identifier(table_name)], task)
+                return result
+            finally:
+                conn.close()
                 
-               
-                f.seek(0)
-                reader = csv.reader(f)
-                next(reader) 
+        def done(result):
+            rows_imported, elapsed = result
+            messagebox.showinfo("Success", f"{rows_imported:,} rows successfully imported into table "
+                                           f"'{table_name}' in {elapsed:.1f}s.")
+            self.set_status(f"CSV import successful: {rows_imported:,} rows")
+            
+        workspace = self.workspace
+        
+        def finish():
+            self.reload_planner_stats(workspace)
+            if self.workspace is workspace:
+                self.refresh_tables()
+                self.refresh_schema()
                 
-                placeholders = ','.join(['?' for _ in headers])
-                insert_sql = f"INSERT INTO {table_name} VALUES ({placeholders})"
+        self.run_background("CSV Import", work, done, finish)
+        
+    def import_json(self):
+        file_path = filedialog.askopenfilename(
+            title="Import JSON File",
+            filetypes=[("JSON Files", "*.json *.ndjson *.jsonl *.json.gz *.json.xz"), ("All Files", "*.*")]
+        )
+        
+        if not file_path:
+            return
+            
+        try:
+            with open_text_file(file_path, 'r') as f:
+                layout = JsonStream(f).layout()
+        except Exception as e:
+            messagebox.showerror("Error", f"JSON file could not be read:\n{e}")
+            return
+            
+        dialog = tk.Toplevel(self)
+        dialog.title("Import JSON")
+        dialog.geometry("480x170")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        options = ttk.Frame(dialog)
+        options.pack(fill=tk.X, padx=10, pady=10)
+        
+        layouts = ('records', 'database')
+        ttk.Label(options, text="File contains:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        layout_combo = ttk.Combobox(options, state='readonly', width=36,
+                                    values=("Records (array or NDJSON) for one table",
+                                            "Database export (one array per table)"))
+        layout_combo.current(layouts.index(layout))
+        layout_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(options, text="Table name:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        name_entry = tk.Entry(options, width=28, bg="#2d2d2d", fg="white", insertbackground="white", relief=tk.FLAT)
+        name_entry.insert(0, os.path.basename(file_path).split('.')[0])
+        name_entry.grid(row=1, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        def start():
+            layout = layouts[layout_combo.current()]
+            table_name = name_entry.get().strip()
+            if layout == 'records' and not table_name:
+                messagebox.showwarning("Warning", "Please enter a table name.", parent=dialog)
+                return
+            dialog.destroy()
+            self.run_json_import(file_path, layout, table_name)
+            
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Button(btn_frame, text="Import", command=start, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+        
+    def run_json_import(self, file_path, layout, table_name=None):
+        connect = self.worker_connector()
+        optimize = self.optimize_var.get()
+        analysis_limit = self.analysis_limit
+        
+        def work(task):
+            conn = connect()
+            try:
+                result = import_json_stream(conn, file_path, layout, table_name, task)
+                if optimize:
+                    optimize_after_import(conn, analysis_limit, [quote_identifier(name) for name in result[0]], task)
+                return result
+            finally:
+                conn.close()
                 
-                rows_imported = 0
-                for row in reader:
-                    self.cursor.execute(insert_sql, row)
-                    rows_imported += 1
-                    
-                self.conn.commit()
+        def done(result):
+            imported, ignored, skipped, empty, elapsed = result
+            text = (f"{sum(imported.values()):,} rows imported into {len(imported)} "
+                    f"table{'s' if len(imported) != 1 else ''} in {elapsed:.1f}s.")
+            if ignored:
+                keys = ", ".join(f"{key} ({count:,})" for key, count in ignored.most_common(5))
+                text += f"\n\nKeys without a matching column were skipped: {keys}"
+            if skipped:
+                names = ", ".join(f"{name} ({count:,})" for name, count in skipped.most_common())
+                text += f"\n\nSQLite internal tables were not imported: {names}"
+            if empty:
+                text += f"\n\nTables without columns to infer were not created: {', '.join(empty)}"
+            messagebox.showinfo("Success", text)
+            self.set_status(f"JSON import successful: {sum(imported.values()):,} rows")
+            
+        workspace = self.workspace
+        
+        def finish():
+            self.reload_planner_stats(workspace)
+            if self.workspace is workspace:
                 self.refresh_tables()
                 self.refresh_schema()
                 
-                messagebox.showinfo("Success", f"{rows_imported} rows successfully imported into table '{table_name}'.")
-                self.set_status(f"CSV import successful: {rows_imported} rows")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"CSV import failed:\n{e}")
+        self.run_background("JSON Import", work, done, finish)
             
   
     def vacuum_db(self):
@@ -1555,18 +5443,160 @@ class SQLiteManager(tk.Tk):
             return
             
         try:
-            self.cursor.execute("PRAGMA integrity_check")
-            result = self.cursor.fetchall()
-            
-            if result[0][0] == 'ok':
-                messagebox.showinfo("Integrity", "✓ Database is OK.")
-            else:
-                messagebox.showwarning("Integrity", f"Problems found:\n{result}")
-                
-            self.set_status("Integrity check completed")
+            tables = self.table_names()
         except Exception as e:
-            messagebox.showerror("Error", f"Integrity check failed:\n{e}")
-            
+            messagebox.showerror("Error", f"Tables could not be loaded:\n{e}")
+            return
+        
+        dialog = tk.Toplevel(self)
+        dialog.title("Integrity Check")
+        dialog.geometry("420x480")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        options = ttk.Frame(dialog)
+        options.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(options, text="Check:").grid(row=0, column=0, sticky=tk.W, pady=3)
+        mode_combo = ttk.Combobox(options, state='readonly', width=16, values=('quick_check', 'integrity_check'))
+        mode_combo.current(0)
+        mode_combo.grid(row=0, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        ttk.Label(options, text="Max problems:").grid(row=1, column=0, sticky=tk.W, pady=3)
+        max_spin = ttk.Spinbox(options, from_=1, to=1000000, width=10)
+        max_spin.set(100)
+        max_spin.grid(row=1, column=1, sticky=tk.W, padx=5, pady=3)
+        
+        fk_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Check foreign keys", variable=fk_var).grid(
+            row=2, column=0, columnspan=2, sticky=tk.W, pady=3)
+        
+        ttk.Label(dialog, text="quick_check skips index content and UNIQUE checks and is much faster on large files.",
+                  foreground="#888888", wraplength=390).pack(fill=tk.X, padx=10)
+        
+        table_frame = ttk.LabelFrame(dialog, text="Tables (none selected = whole database)", padding=10)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        table_scroll = ttk.Scrollbar(table_frame)
+        table_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        table_list = tk.Listbox(table_frame, selectmode=tk.EXTENDED, yscrollcommand=table_scroll.set,
+                                bg="#2d2d2d", fg="white", selectbackground="#0078d4",
+                                relief=tk.FLAT, activestyle='none', exportselection=False)
+        table_list.pack(fill=tk.BOTH, expand=True)
+        table_scroll.config(command=table_list.yview)
+        for table in tables:
+            table_list.insert(tk.END, table)
+        
+        def start():
+            try:
+                max_errors = max(1, int(max_spin.get()))
+            except ValueError:
+                max_errors = 100
+            selected = [table_list.get(i) for i in table_list.curselection()]
+            scopes = ([self.split_table_name(table) for table in selected] or
+                      [(schema, None) for schema in ['main'] + list(self.attached)])
+            dialog.destroy()
+            self.run_integrity_check(mode_combo.get(), scopes, max_errors, fk_var.get())
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        ttk.Button(btn_frame, text="Start", command=start, style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.LEFT)
+    
+    def run_integrity_check(self, mode, scopes, max_errors, foreign_keys):
+        connect = self.worker_connector()
+        db_path = self.db_path
+        started = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        def work(task):
+            conn = connect()
+            try:
+                return check_database(conn, mode, scopes, max_errors, foreign_keys, task)
+            finally:
+                conn.close()
+        
+        def done(result):
+            problems, elapsed, limit_reached = result
+            self.show_integrity_report({
+                'database': db_path,
+                'check': mode,
+                'foreign_key_check': foreign_keys,
+                'scope': [f"{schema}.{table}" if table else schema for schema, table in scopes],
+                'started': started,
+                'elapsed': round(elapsed, 3),
+                'max_problems': max_errors,
+                'limit_reached': limit_reached,
+                'problems': [{'check': check, 'object': obj, 'detail': detail} for check, obj, detail in problems]
+            })
+            self.set_status(f"Integrity check completed: {len(problems):,} problems")
+        
+        self.run_background("Integrity Check", work, done)
+    
+    def show_integrity_report(self, report):
+        problems = report['problems']
+        dialog = tk.Toplevel(self)
+        dialog.title("Integrity Report")
+        dialog.geometry("800x420")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        if problems:
+            summary = f"✗ {len(problems):,} problems found"
+            if report['limit_reached']:
+                summary += f" (stopped at the limit of {report['max_problems']:,})"
+        else:
+            summary = "✓ No problems found"
+        checks = report['check'] + (" + foreign_key_check" if report['foreign_key_check'] else "")
+        ttk.Label(dialog, text=f"{summary} | {checks} of {', '.join(report['scope'])} | {report['elapsed']:.1f}s",
+                  font=("Segoe UI", 10, "bold"), wraplength=770).pack(fill=tk.X, padx=10, pady=(10, 0))
+        
+        tree_frame = ttk.Frame(dialog)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical")
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        columns = ('Check', 'Object', 'Detail')
+        tree = ttk.Treeview(tree_frame, columns=columns, show='headings', yscrollcommand=vsb.set)
+        tree.pack(fill=tk.BOTH, expand=True)
+        vsb.config(command=tree.yview)
+        for col, width in (('Check', 130), ('Object', 160), ('Detail', 480)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width, stretch=col == 'Detail')
+        for problem in problems:
+            tree.insert('', tk.END, values=(problem['check'], problem['object'], problem['detail']))
+        
+        def export():
+            file_path = filedialog.asksaveasfilename(
+                title="Export Integrity Report",
+                defaultextension=".json",
+                filetypes=[("JSON Files", "*.json"), ("CSV Files", "*.csv"), ("All Files", "*.*")],
+                parent=dialog
+            )
+            if not file_path:
+                return
+            try:
+                if file_path.endswith('.csv'):
+                    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+                        writer = csv.writer(f)
+                        writer.writerow(('check', 'object', 'detail'))
+                        writer.writerows((p['check'], p['object'], p['detail']) for p in problems)
+                else:
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        json.dump(report, f, indent=2, ensure_ascii=False)
+            except Exception as e:
+                messagebox.showerror("Error", f"Export failed:\n{e}", parent=dialog)
+                return
+            self.set_status(f"Integrity report exported to {os.path.basename(file_path)}")
+        
+        btn_frame = ttk.Frame(dialog)
+        btn_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        
+        ttk.Button(btn_frame, text="Export...", command=export).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Close", command=dialog.destroy).pack(side=tk.LEFT)
+        
     def show_db_info(self):
         if not self.conn:
             messagebox.showwarning("Warning", "Please open a database first.")
@@ -1638,7 +5668,387 @@ class SQLiteManager(tk.Tk):
             
         except Exception as e:
             messagebox.showerror("Error", f"Information could not be loaded:\n{e}")
+    
+    def show_wal_panel(self):
+        if not self.conn:
+            messagebox.showwarning("Warning", "Please open a database first.")
+            return
+        
+        workspace = self.workspace
+        
+        dialog = tk.Toplevel(self)
+        dialog.title("WAL Checkpoints" if len(self.workspaces) == 1 else f"WAL Checkpoints ({workspace.name})")
+        dialog.geometry("760x520")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        columns = ('Schema', 'Journal Mode', 'WAL Size', 'WAL Frames', 'Checkpointed', 'Pending')
+        tree = ttk.Treeview(dialog, columns=columns, show='headings', height=5)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110, anchor=tk.W if col in ('Schema', 'Journal Mode') else tk.E)
+        tree.pack(fill=tk.X, padx=10, pady=10)
+        
+        auto_frame = ttk.Frame(dialog)
+        auto_frame.pack(fill=tk.X, padx=10)
+        ttk.Label(auto_frame, text="wal_autocheckpoint (this connection):").pack(side=tk.LEFT)
+        auto_spin = ttk.Spinbox(auto_frame, from_=0, to=1000000, width=10)
+        auto_spin.pack(side=tk.LEFT, padx=5)
+        
+        def set_autocheckpoint():
+            try:
+                pages = max(0, int(auto_spin.get()))
+                workspace.conn.execute(f"PRAGMA wal_autocheckpoint = {pages}")
+            except Exception as e:
+                messagebox.showerror("Error", f"wal_autocheckpoint could not be set:\n{e}", parent=dialog)
+                return
+            self.set_status(f"wal_autocheckpoint set to {pages:,} pages")
+        
+        ttk.Button(auto_frame, text="Set", command=set_autocheckpoint).pack(side=tk.LEFT)
+        
+        manual_frame = ttk.LabelFrame(dialog, text="Checkpoint", padding=10)
+        manual_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(manual_frame, text="Mode:").pack(side=tk.LEFT)
+        mode_combo = ttk.Combobox(manual_frame, state='readonly', width=12, values=CHECKPOINT_MODES)
+        mode_combo.current(0)
+        mode_combo.pack(side=tk.LEFT, padx=5)
+        
+        def checkpoint():
+            if self.workspace is not workspace:
+                messagebox.showwarning("Warning", f"Switch back to workspace '{workspace.name}' first.", parent=dialog)
+                return
+            mode = mode_combo.get()
+            paths = {'main': workspace.db_path, **workspace.attached}
+            connect = self.worker_connector()
+            
+            def work(task):
+                task.report(f"Running {mode} checkpoint...")
+                conn = connect()
+                try:
+                    return checkpoint_databases(conn, paths, mode)
+                finally:
+                    conn.close()
+            
+            def done(results):
+                messagebox.showinfo("Checkpoint", f"{mode} checkpoint finished:\n" + "\n".join(describe_checkpoint(results)))
+                self.set_status(f"{mode} checkpoint finished")
+            
+            self.run_background("WAL Checkpoint", work, done)
+        
+        ttk.Button(manual_frame, text="Checkpoint Now", command=checkpoint,
+                   style="Accent.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Label(manual_frame, text="FULL, RESTART and TRUNCATE wait for readers and writers",
+                  foreground="#888888").pack(side=tk.LEFT, padx=5)
+        
+        policy = workspace.checkpoint_policy or {'mode': 'PASSIVE', 'interval': 60, 'threshold': 10000}
+        policy_frame = ttk.LabelFrame(dialog, text="Scheduled checkpoint", padding=10)
+        policy_frame.pack(fill=tk.X, padx=10)
+        
+        enabled_var = tk.BooleanVar(value=workspace.checkpoint_policy is not None)
+        ttk.Checkbutton(policy_frame, text="Enabled", variable=enabled_var).grid(row=0, column=0, sticky=tk.W, pady=3)
+        ttk.Label(policy_frame, text="Mode:").grid(row=0, column=1, sticky=tk.W, padx=(15, 0))
+        policy_mode = ttk.Combobox(policy_frame, state='readonly', width=12, values=CHECKPOINT_MODES)
+        policy_mode.current(CHECKPOINT_MODES.index(policy['mode']))
+        policy_mode.grid(row=0, column=2, sticky=tk.W, padx=5)
+        
+        ttk.Label(policy_frame, text="Every (seconds, 0 = off):").grid(row=1, column=0, sticky=tk.W, pady=3)
+        interval_spin = ttk.Spinbox(policy_frame, from_=0, to=86400, width=10)
+        interval_spin.set(policy['interval'])
+        interval_spin.grid(row=1, column=1, sticky=tk.W, padx=5)
+        
+        ttk.Label(policy_frame, text="When pending frames reach (0 = off):").grid(row=2, column=0, sticky=tk.W, pady=3)
+        threshold_spin = ttk.Spinbox(policy_frame, from_=0, to=10000000, width=10)
+        threshold_spin.set(policy['threshold'])
+        threshold_spin.grid(row=2, column=1, sticky=tk.W, padx=5)
+        
+        def apply_policy():
+            if not enabled_var.get():
+                workspace.checkpoint_policy = None
+                self.set_status("Scheduled checkpoint disabled")
+                return
+            try:
+                interval = max(0, int(interval_spin.get()))
+                threshold = max(0, int(threshold_spin.get()))
+            except ValueError:
+                messagebox.showwarning("Warning", "Interval and frame threshold must be whole numbers.", parent=dialog)
+                return
+            if not interval and not threshold:
+                messagebox.showwarning("Warning", "Set an interval, a frame threshold or both.", parent=dialog)
+                return
+            workspace.checkpoint_policy = {'mode': policy_mode.get(), 'interval': interval, 'threshold': threshold,
+                                           'last_run': time.time(), 'last_result': None}
+            self.set_status(f"Scheduled {policy_mode.get()} checkpoint enabled")
+        
+        ttk.Button(policy_frame, text="Apply", command=apply_policy).grid(row=2, column=2, sticky=tk.W, padx=5)
+        
+        policy_label = ttk.Label(dialog, text="", foreground="#888888", wraplength=720)
+        policy_label.pack(fill=tk.X, padx=10, pady=5)
+        
+        def refresh():
+            if not dialog.winfo_exists():
+                return
+            if workspace.conn:
+                paths = {'main': workspace.db_path, **workspace.attached}
+                try:
+                    status = wal_status(workspace.conn, paths)
+                    autocheckpoint = workspace.conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+                except sqlite3.Error:
+                    status = None
+                if status is not None:
+                    self.clear_tree(tree)
+                    for schema, mode, wal_size, index in status:
+                        frames = (f"{index[0]:,}", f"{index[1]:,}", f"{index[0] - index[1]:,}") if index else ("-",) * 3
+                        tree.insert('', tk.END, values=(schema, mode, format_size(wal_size) if wal_size is not None else "-",
+                                                        *frames))
+                    if self.focus_get() is not auto_spin:
+                        auto_spin.set(autocheckpoint)
+            
+            current = workspace.checkpoint_policy
+            if current and current['last_result']:
+                finished, lines = current['last_result']
+                policy_label.config(text=f"Last scheduled checkpoint at {time.strftime('%H:%M:%S', time.localtime(finished))}: "
+                                         + "; ".join(lines))
+            else:
+                policy_label.config(text="No scheduled checkpoint has run yet" if current else "")
+            dialog.after(WAL_PANEL_REFRESH_MS, refresh)
+        
+        refresh()
+        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=10)
+    
+    def run_checkpoint_policies(self):
+        self.after(CHECKPOINT_POLL_MS, self.run_checkpoint_policies)
+        now = time.time()
+        
+        for workspace in self.workspaces:
+            policy = workspace.checkpoint_policy
+            if not policy or not workspace.conn or workspace.busy or not workspace.jobs.empty():
+                continue
+            paths = {'main': workspace.db_path, **workspace.attached}
+            pending = sum(mx_frame - backfilled for mx_frame, backfilled in filter(None, map(read_wal_index, paths.values())))
+            due = policy['interval'] and now - policy['last_run'] >= policy['interval']
+            if not pending or not (due or policy['threshold'] and pending >= policy['threshold']):
+                continue
+            policy['last_run'] = now
+            
+            def job(connect=self.worker_connector(workspace), policy=policy, paths=paths):
+                try:
+                    conn = connect()
+                    try:
+                        lines = describe_checkpoint(checkpoint_databases(conn, paths, policy['mode']))
+                    finally:
+                        conn.close()
+                except sqlite3.Error as e:
+                    lines = [f"failed: {e}"]
+                policy['last_result'] = (time.time(), lines)
+            
+            workspace.submit(job)
+    
+    def optimize_connection(self, workspace):
+        conn = workspace.conn
+        if not self.optimize_var.get() or conn.in_transaction or workspace.busy or not workspace.jobs.empty():
+            return
+        try:
+            # the connection is closed right after, so never wait on another writer's lock
+            conn.execute("PRAGMA busy_timeout = 0")
+            optimize_database(conn, self.analysis_limit, ())
+        except sqlite3.Error:
+            pass
+    
+    def reload_planner_stats(self, workspace):
+        conn = workspace.conn
+        if not conn or conn.in_transaction:
+            return
+        try:
+            for schema in ['main'] + list(workspace.attached):
+                if conn.execute(f"SELECT 1 FROM {schema}.sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+                    conn.execute(f"ANALYZE {schema}.sqlite_master")
+        except sqlite3.Error:
+            pass
+    
+    def exit_app(self):
+        for workspace in self.workspaces:
+            if workspace.conn:
+                self.optimize_connection(workspace)
+        self.quit()
+    
+    def show_planner_stats(self):
+        if not self.conn:
+            messagebox.showwarning("Warning", "Please open a database first.")
+            return
+        
+        workspace = self.workspace
+        
+        dialog = tk.Toplevel(self)
+        dialog.title("Planner Statistics" if len(self.workspaces) == 1 else f"Planner Statistics ({workspace.name})")
+        dialog.geometry("860x560")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        
+        toolbar = ttk.Frame(dialog)
+        toolbar.pack(fill=tk.X, padx=10, pady=10)
+        
+        ttk.Label(toolbar, text="analysis_limit (rows per index, 0 = all):").pack(side=tk.LEFT)
+        limit_spin = ttk.Spinbox(toolbar, from_=0, to=100000000, width=10)
+        limit_spin.set(self.analysis_limit)
+        limit_spin.pack(side=tk.LEFT, padx=5)
+        
+        def analysis_limit():
+            try:
+                self.analysis_limit = max(0, int(limit_spin.get()))
+            except ValueError:
+                limit_spin.set(self.analysis_limit)
+            return self.analysis_limit
+        
+        def run(title, action):
+            if self.workspace is not workspace:
+                messagebox.showwarning("Warning", f"Switch back to workspace '{workspace.name}' first.", parent=dialog)
+                return
+            connect = self.worker_connector()
+            limit = analysis_limit()
+            
+            def work(task):
+                task.report(f"{title}...")
+                conn = connect()
+                try:
+                    return action(conn, limit)
+                finally:
+                    conn.close()
+            
+            def done(result):
+                self.set_status(f"{title} finished")
             
+            def finish():
+                self.reload_planner_stats(workspace)
+                if dialog.winfo_exists():
+                    load()
+            
+            self.run_background(title, work, done, finish)
+        
+        ttk.Button(toolbar, text="Run ANALYZE", style="Accent.TButton",
+                   command=lambda: run("ANALYZE", analyze_database)).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="PRAGMA optimize",
+                   command=lambda: run("PRAGMA optimize", optimize_database)).pack(side=tk.LEFT)
+        
+        tree_frame = ttk.Frame(dialog)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        
+        vsb = ttk.Scrollbar(tree_frame, orient="vertical")
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        columns = ('Rows (est.)', 'Avg rows per key prefix', 'Flags', 'stat4 samples')
+        tree = ttk.Treeview(tree_frame, columns=columns, yscrollcommand=vsb.set)
+        tree.pack(fill=tk.BOTH, expand=True)
+        vsb.config(command=tree.yview)
+        tree.heading('#0', text='Table / Index')
+        tree.column('#0', width=240)
+        for col, width in zip(columns, (110, 260, 120, 100)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width, anchor=tk.W if col == 'Avg rows per key prefix' else tk.E)
+        
+        stat4_label = ttk.Label(dialog, text="", foreground="#888888", wraplength=820)
+        stat4_label.pack(fill=tk.X, padx=10, pady=(5, 0))
+        
+        def load():
+            self.clear_tree(tree)
+            stat4_available = False
+            try:
+                for schema in ['main'] + list(workspace.attached):
+                    tables, stat1, stat4 = planner_stats(workspace.conn, schema)
+                    stat4_available = stat4_available or stat4 is not None
+                    for table in tables:
+                        label = table if schema == 'main' else f"{schema}.{table}"
+                        entries = stat1.get(table, [])
+                        rows = next((stat.split()[0] for _, stat in entries if stat), None)
+                        parent = tree.insert('', tk.END, text=label, open=True,
+                                             values=(f"{int(rows):,}" if rows else "not analyzed", "", "", ""))
+                        for idx, stat in entries:
+                            if idx is None:
+                                continue
+                            tokens = (stat or "").split()
+                            numbers = [token for token in tokens[1:] if token.isdigit()]
+                            flags = [token for token in tokens[1:] if not token.isdigit()]
+                            samples = stat4.get((table, idx), []) if stat4 is not None else []
+                            item = tree.insert(parent, tk.END, text=idx,
+                                               values=(f"{int(tokens[0]):,}" if tokens else "", " / ".join(numbers),
+                                                       " ".join(flags), f"{len(samples):,}" if stat4 is not None else "-"))
+                            for neq, nlt, ndlt in samples:
+                                tree.insert(item, tk.END, text="sample",
+                                            values=("", f"eq {neq} | lt {nlt} | distinct lt {ndlt}", "", ""))
+            except sqlite3.Error as e:
+                messagebox.showerror("Error", f"Statistics could not be loaded:\n{e}", parent=dialog)
+            stat4_label.config(text="" if stat4_available else
+                               "sqlite_stat4 is not present; it is only written by SQLite builds with SQLITE_ENABLE_STAT4.")
+        
+        policy = workspace.analyze_policy or {'interval': 3600}
+        policy_frame = ttk.LabelFrame(dialog, text="Scheduled ANALYZE", padding=10)
+        policy_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        enabled_var = tk.BooleanVar(value=workspace.analyze_policy is not None)
+        ttk.Checkbutton(policy_frame, text="Enabled", variable=enabled_var).pack(side=tk.LEFT)
+        ttk.Label(policy_frame, text="Every (minutes):").pack(side=tk.LEFT, padx=(15, 0))
+        interval_spin = ttk.Spinbox(policy_frame, from_=1, to=10080, width=8)
+        interval_spin.set(policy['interval'] // 60)
+        interval_spin.pack(side=tk.LEFT, padx=5)
+        
+        policy_label = ttk.Label(policy_frame, text="", foreground="#888888")
+        
+        def apply_policy():
+            if not enabled_var.get():
+                workspace.analyze_policy = None
+                policy_label.config(text="")
+                self.set_status("Scheduled ANALYZE disabled")
+                return
+            try:
+                minutes = max(1, int(interval_spin.get()))
+            except ValueError:
+                messagebox.showwarning("Warning", "The interval must be a whole number of minutes.", parent=dialog)
+                return
+            analysis_limit()
+            workspace.analyze_policy = {'interval': minutes * 60, 'last_run': time.time(), 'last_result': None,
+                                        'reload': False}
+            policy_label.config(text=f"Next run in {minutes} min")
+            self.set_status(f"Scheduled ANALYZE every {minutes} min")
+        
+        ttk.Button(policy_frame, text="Apply", command=apply_policy).pack(side=tk.LEFT, padx=5)
+        policy_label.pack(side=tk.LEFT, padx=5)
+        if workspace.analyze_policy and workspace.analyze_policy['last_result']:
+            finished, text = workspace.analyze_policy['last_result']
+            policy_label.config(text=f"Last run at {time.strftime('%H:%M:%S', time.localtime(finished))}: {text}")
+        
+        ttk.Checkbutton(dialog, text="Run PRAGMA optimize on close and on exit, and analyze new tables after imports",
+                        variable=self.optimize_var).pack(anchor=tk.W, padx=10)
+        
+        load()
+        ttk.Button(dialog, text="Close", command=dialog.destroy).pack(pady=10)
+    
+    def run_analyze_policies(self):
+        self.after(ANALYZE_POLL_MS, self.run_analyze_policies)
+        now = time.time()
+        
+        for workspace in self.workspaces:
+            policy = workspace.analyze_policy
+            if not policy or not workspace.conn:
+                continue
+            if policy['reload'] and not workspace.conn.in_transaction:
+                policy['reload'] = False
+                self.reload_planner_stats(workspace)
+            if now - policy['last_run'] < policy['interval'] or workspace.busy or not workspace.jobs.empty():
+                continue
+            policy['last_run'] = now
+            
+            def job(connect=self.worker_connector(workspace), policy=policy, analysis_limit=self.analysis_limit):
+                try:
+                    conn = connect()
+                    try:
+                        text = f"completed in {analyze_database(conn, analysis_limit):.1f}s"
+                    finally:
+                        conn.close()
+                    policy['reload'] = True
+                except sqlite3.Error as e:
+                    text = f"failed: {e}"
+                policy['last_result'] = (time.time(), text)
+            
+            workspace.submit(job)
     
     def show_table_context_menu(self, event):
         selection = self.table_listbox.curselection()
@@ -1650,6 +6060,7 @@ class SQLiteManager(tk.Tk):
         
         menu.add_command(label="Show Data", command=lambda: self.on_table_select())
         menu.add_command(label="Table Info", command=self.show_table_info)
+        menu.add_command(label="Profile Columns", command=self.profile_columns)
         menu.add_separator()
         menu.add_command(label="Export", command=self.export_table)
         menu.add_separator()
@@ -1755,6 +6166,80 @@ Example: SELECT * FROM users WHERE name LIKE 'A%';
             "Built with Python and Tkinter")
         
    
+    def worker_connector(self, workspace=None):
+        workspace = workspace or self.workspace
+        db_path = workspace.db_path
+        attached = dict(workspace.attached)
+        
+        def connect():
+            conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+            for alias, path in attached.items():
+                conn.execute(f"ATTACH DATABASE ? AS {alias}", (path,))
+            return conn
+        return connect
+        
+    def run_background(self, title, work, on_done=None, on_finish=None):
+        task = BackgroundTask(title)
+        workspace = self.workspace
+        
+        dialog = tk.Toplevel(self)
+        dialog.title(title if len(self.workspaces) == 1 else f"{title} ({workspace.name})")
+        dialog.geometry("450x150")
+        dialog.configure(bg="#1e1e1e")
+        dialog.transient(self)
+        dialog.protocol("WM_DELETE_WINDOW", task.cancel)
+        
+        queued = workspace.busy or not workspace.jobs.empty()
+        label = ttk.Label(dialog, text="Queued behind another task..." if queued else "Starting...",
+                          wraplength=420)
+        label.pack(fill=tk.X, padx=15, pady=(15, 5))
+        
+        progress = ttk.Progressbar(dialog, mode='indeterminate', maximum=1.0)
+        progress.pack(fill=tk.X, padx=15, pady=5)
+        progress.start(10)
+        
+        ttk.Button(dialog, text="Cancel", command=task.cancel).pack(pady=10)
+        
+        def runner():
+            try:
+                task.check_cancelled()
+                task.messages.put(('done', work(task)))
+            except TaskCancelled:
+                task.messages.put(('cancelled', None))
+            except Exception as e:
+                task.messages.put(('error', e))
+                
+        def poll():
+            try:
+                while True:
+                    kind, *payload = task.messages.get_nowait()
+                    if kind == 'progress':
+                        text, fraction = payload
+                        label.config(text=text)
+                        if fraction is not None:
+                            progress.stop()
+                            progress.config(mode='determinate', value=fraction)
+                        continue
+                        
+                    dialog.destroy()
+                    if on_finish:
+                        on_finish()
+                    if kind == 'done':
+                        if on_done:
+                            on_done(payload[0])
+                    elif kind == 'cancelled':
+                        self.set_status(f"{title}: cancelled")
+                    else:
+                        messagebox.showerror("Error", f"{title} failed:\n{payload[0]}")
+                    return
+            except queue.Empty:
+                pass
+            self.after(100, poll)
+            
+        workspace.submit(runner)
+        self.after(100, poll)
+        return task
+        
     def clear_tree(self, tree):
         for item in tree.get_children():
             tree.delete(item)